@@ -13,16 +13,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Mapping, Optional
+from typing import Any, Mapping, Optional, Sequence
 
 from .common import OrderParam, ResultDict, ResultsDict, SupportedTypes, ValueParam, WhereParam
 from .common import VDBError
 
 import logging
+import re
 import psycopg2
 import psycopg2.extras
 import psycopg2.errorcodes
 
+# Matches an escaped % or a named (%(name)s) query parameter
+_PARAM_RE = re.compile(r'%%|%\((\w+)\)s')
+
+
+def _number_params(query: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Convert a query with named (%(name)s) parameters to one with numbered ($n) ones, as PREPARE expects
+
+    @param query    The query
+    @return A tuple of (query, parameter names in $n order)
+    """
+    params: dict[str, int] = {}
+
+    def _repl(m: re.Match[str]) -> str:
+        if m.group(1) is None:
+            return '%'
+        return f'${params.setdefault(m.group(1), len(params) + 1)}'
+
+    return _PARAM_RE.sub(_repl, query), tuple(params)
+
 
 class DB0:
     """!
@@ -37,6 +58,12 @@ class DB0:
     # True if there was a rollback
     transaction_rollback: bool
 
+    # Tables whose row types have been registered with psycopg2
+    _row_types: set[str]
+
+    # Prepared statements of this connection, as query -> (statement name, parameter names in $n order)
+    _prepared: dict[str, tuple[str, tuple[str, ...]]]
+
     def __init__(self, dbname: str, dbuser: Optional[str], dbpass: Optional[str] = None, dbhost: Optional[str] = None,
                  dbport: Optional[int] = None):
         logging.debug('Connecting to %s@%s:%s (user=%s)', dbname, dbhost, dbport, dbuser)
@@ -44,6 +71,8 @@ class DB0:
         self.db = self._connect(dbname=dbname, dbuser=dbuser, dbpass=dbpass, dbhost=dbhost, dbport=dbport)
         self.transaction_depth = 0
         self.transaction_rollback = False
+        self._row_types = set()
+        self._prepared = {}
 
     def _connect(self, dbname: str, dbuser: Optional[str], dbpass: Optional[str], dbhost: Optional[str],
                  dbport: Optional[int]) -> psycopg2.extensions.connection:
@@ -89,14 +118,8 @@ class DB0:
         cur = self.db.cursor()
         cur.execute(query, kwargs)
 
-        ret = []
-        for x in cur:
-            dt = {}
-            for idx, v in enumerate(cur.description):
-                dt[v.name] = x[idx]
-            ret.append(dt)
-
-        return ret
+        labels = [x.name for x in cur.description]
+        return [dict(zip(labels, x)) for x in cur]
 
     def _exec(self, query: str, args: Optional[Mapping[str, SupportedTypes]] = None) -> psycopg2.extensions.cursor:
         """
@@ -113,6 +136,82 @@ class DB0:
 
         return cur
 
+    def _form_where(self, where: WhereParam, args: dict[str, SupportedTypes]) -> str:
+        """
+        Form a WHERE clause
+
+        @param where    A dictionary of k/v pairs
+        @param args     The query args. Updated with the values of the clause.
+        @return The WHERE clause, including a leading space
+        """
+        t = []
+        for w, w_value in where.items():
+            if w_value is None:
+                t.append(f'{w} IS NULL')
+            else:
+                name2 = 'w_' + w
+                args[name2] = w_value
+                t.append(f'{w}=%({name2})s')
+        return ' WHERE ' + ' AND '.join(t)
+
+    def _form_multi_query(self, tables: Sequence[str],
+                          where: Optional[WhereParam] = None) -> tuple[str, dict[str, SupportedTypes]]:
+        """
+        Form a query that reads multiple tables at once
+
+        Each table becomes a column that holds an array of the matching rows.
+
+        @param tables   The table names
+        @param where    A dictionary of k/v pairs, applied to all tables
+        @return A tuple of (query, args)
+        """
+        args: dict[str, SupportedTypes] = {}
+        cond = self._form_where(where, args) if where else ''
+        selects = [f'ARRAY(SELECT _row FROM {tbl} _row{cond}) AS {tbl}' for tbl in tables]
+        return 'SELECT ' + ', '.join(selects), args
+
+    def _register_row_type(self, table: str) -> None:
+        """Registers the row type of a table so that psycopg2 returns its rows as namedtuples."""
+        assert self.db is not None
+        if table in self._row_types:
+            return
+        psycopg2.extras.register_composite(table, self.db)
+        self._row_types.add(table)
+
+    def _prepared_query(self, query: str, args: Mapping[str, SupportedTypes]) -> str:
+        """
+        Prepare a query on the server, once per connection, and return a query that executes it
+
+        Prepared statements belong to the session and outlive transactions, so already prepared queries are
+        executed within transactions too. New ones are only prepared outside of transactions: the PREPARE would
+        run in the caller's transaction, so a failing one would abort it, and it can't run at all in a transaction
+        that has already failed. In that case the query is returned as is.
+
+        @param query    A query with named (%(name)s) parameters
+        @param args     The query args. Each of them must be used by the query.
+        @return The query to run with args
+        """
+        stmt = self._prepared.get(query)
+        if stmt is None:
+            name = f'vdb_stmt_{len(self._prepared)}'
+            query2, params = _number_params(query)
+        else:
+            name, params = stmt
+
+        unused = set(args) - set(params)
+        if unused:
+            raise VDBError(f'Args not used by the query: {", ".join(sorted(unused))}')
+
+        if stmt is None:
+            if self.transaction_depth > 0:
+                return query
+            self._exec(f'PREPARE {name} AS {query2}')
+            self._prepared[query] = (name, params)
+
+        if not params:
+            return f'EXECUTE {name}'
+        return f'EXECUTE {name}(' + ', '.join(f'%({x})s' for x in params) + ')'
+
     def _form_query(self, what: str, tbl: str,
                     values: Optional[ValueParam] = None,
                     where: Optional[WhereParam] = None,
@@ -162,16 +261,7 @@ class DB0:
             q += ' ' + ', '.join(t)
 
         if what in ('select', 'update', 'delete') and where:
-            q += ' WHERE '
-            t = []
-            for w, w_value in where.items():
-                if w_value is None:
-                    t.append(f'{w} IS NULL')
-                else:
-                    name2 = 'w_' + w
-                    args[name2] = w_value
-                    t.append(f'{w}=%({name2})s')
-            q += ' AND '.join(t)
+            q += self._form_where(where, args)
 
         if sort:
             q += ' ORDER BY '
@@ -226,16 +316,22 @@ class DB0:
         """
         cur = self._exec(query, args)
 
-        dt0 = cur.fetchall()
-        ret: ResultsDict = []
-
+        # Iterate the cursor instead of fetchall() so that only the result dicts get materialized, not an
+        # intermediate list of tuples as well
         labels = [x.name for x in cur.description]
-        for d in dt0:
-            r: ResultDict = dict(list(zip(labels, d)))
-            ret.append(r)
+        ret: ResultsDict = [dict(zip(labels, d)) for d in cur]
 
         return ret
 
+    def read_prepared(self, query: str, args: Mapping[str, SupportedTypes]) -> ResultsDict:
+        """!
+        Same as read_q() but the query is prepared once per connection. For queries that are repeated a lot.
+
+        @param query    A query with named (%(name)s) parameters only
+        @param args     The query args
+        """
+        return self.read_q(self._prepared_query(query, args), args)
+
     def read_flat(self, table: str, where: Optional[WhereParam] = None,
                   sort: Optional[OrderParam] = None) -> ResultsDict:
         """!
@@ -253,6 +349,33 @@ class DB0:
 
         return ret
 
+    def read_flat_multi(self, tables: Sequence[str], where: Optional[WhereParam] = None) -> dict[str, ResultsDict]:
+        """!
+        Same as read_flat() for multiple tables, but with a single query
+
+        The rows of each table are read as an array of the table's row type, so they keep their column types
+        without needing a round-trip per table. The query is prepared since it is normally repeated for every
+        domain.
+
+        @param tables       The table names
+        @param where        Dictionary for the WHERE clause, applied to all tables
+        @return A dict of table name -> list of entries. Each entry is a dictionary.
+        """
+        for table in tables:
+            self._register_row_type(table)
+
+        query, args = self._form_multi_query(tables, where)
+        res = self.read_prepared(query, args)
+        assert len(res) == 1
+
+        ret: dict[str, ResultsDict] = {}
+        for table in tables:
+            # A list of namedtuples, as registered by _register_row_type()
+            rows: Any = res[0][table]
+            ret[table] = [x._asdict() for x in rows]
+
+        return ret
+
     def read_one(self, table: str, where: WhereParam, sort: Optional[OrderParam] = None) -> Optional[ResultDict]:
         """!
         Same as read_flat but assume there's only one result
@@ -16,10 +16,12 @@
 # pylint: disable=protected-access
 
 import unittest
+import collections
 import unittest.mock
 import parameterized
 
 from . import db as vdb_db
+from .common import VDBError
 from .db import DB0
 
 
@@ -63,3 +65,89 @@ class DBTest(unittest.TestCase):
         query, args = db._form_query(what, 'table', values, where, sort)
         st = query % args
         self.assertEqual(st, result)
+
+    @parameterized.parameterized.expand([
+        (['t1'], None, 'SELECT ARRAY(SELECT _row FROM t1 _row) AS t1'),
+        (['t1', 't2'], {'k1': 'v1'},
+         'SELECT ARRAY(SELECT _row FROM t1 _row WHERE k1=v1) AS t1, ARRAY(SELECT _row FROM t2 _row WHERE k1=v1) AS t2'),
+    ])
+    def test_form_multi_query(self, tables: list, where: dict, result: str) -> None:
+        db = self._get_db()
+        query, args = db._form_multi_query(tables, where)
+        st = query % args
+        self.assertEqual(st, result)
+
+    def test_read_flat_multi(self) -> None:
+        db = self._get_db()
+        row = collections.namedtuple('row', ['k1', 'k2'])
+        with unittest.mock.patch.object(db, 'read_q') as read_q:
+            read_q.return_value = [{'t1': [row('a', 1), row('b', 2)], 't2': []}]
+            res = db.read_flat_multi(['t1', 't2'], {'k1': 'v1'})
+
+        self.assertEqual(res, {'t1': [{'k1': 'a', 'k2': 1}, {'k1': 'b', 'k2': 2}], 't2': []})
+        self.assertEqual(self._psycopg2_extras.register_composite.call_count, 2)
+
+    def test_prepared_query(self) -> None:
+        db = self._get_db()
+        query = 'SELECT * FROM t1 WHERE k1=%(w_k1)s AND k2=%(w_k2)s'
+        args = {'w_k1': 'v1', 'w_k2': 'v2'}
+        with unittest.mock.patch.object(db, '_exec') as exec_:
+            q1 = db._prepared_query(query, args)
+            q2 = db._prepared_query(query, args)
+            exec_.assert_called_once_with('PREPARE vdb_stmt_0 AS SELECT * FROM t1 WHERE k1=$1 AND k2=$2')
+
+            self.assertEqual(q1, 'EXECUTE vdb_stmt_0(%(w_k1)s, %(w_k2)s)')
+            self.assertEqual(q1, q2)
+
+            # New queries aren't prepared within transactions, but prepared ones are still used
+            db.transaction_depth = 1
+            self.assertEqual(db._prepared_query('SELECT 1', {}), 'SELECT 1')
+            self.assertEqual(db._prepared_query(query, args), q1)
+            exec_.assert_called_once()
+
+    def test_prepared_query_params(self) -> None:
+        db = self._get_db()
+        query = "SELECT * FROM t1 WHERE k1=%(b)s AND k2=%(a)s AND k3 LIKE 'x%%' AND k4=%(b)s"
+        with unittest.mock.patch.object(db, '_exec') as exec_:
+            q1 = db._prepared_query(query, {'a': 1, 'b': 2})
+            # The order of the args doesn't matter
+            q2 = db._prepared_query(query, {'b': 2, 'a': 1})
+
+        exec_.assert_called_once_with("PREPARE vdb_stmt_0 AS SELECT * FROM t1 WHERE k1=$1 AND k2=$2 AND k3 LIKE 'x%' "
+                                      "AND k4=$1")
+        self.assertEqual(q1, 'EXECUTE vdb_stmt_0(%(b)s, %(a)s)')
+        self.assertEqual(q1, q2)
+
+    def test_prepared_query_unused_args(self) -> None:
+        db = self._get_db()
+        query = 'SELECT * FROM t1 WHERE k1=%(k1)s'
+        with unittest.mock.patch.object(db, '_exec') as exec_:
+            with self.assertRaises(VDBError):
+                db._prepared_query(query, {'k1': 'v1', 'k2': 'v2'})
+            exec_.assert_not_called()
+
+            db._prepared_query(query, {'k1': 'v1'})
+            with self.assertRaises(VDBError):
+                db._prepared_query(query, {'k1': 'v1', 'k2': 'v2'})
+
+    def test_read_prepared(self) -> None:
+        db = self._get_db()
+        with unittest.mock.patch.object(db, '_exec') as exec_, \
+                unittest.mock.patch.object(db, 'read_q', return_value=[]) as read_q:
+            db.read_prepared('SELECT * FROM t1 WHERE k1=%(k1)s', {'k1': 'v1'})
+            db.read_prepared('SELECT * FROM t1 WHERE k1=%(k1)s', {'k1': 'v2'})
+
+        exec_.assert_called_once_with('PREPARE vdb_stmt_0 AS SELECT * FROM t1 WHERE k1=$1')
+        read_q.assert_called_with('EXECUTE vdb_stmt_0(%(k1)s)', {'k1': 'v2'})
+
+    def test_read_q(self) -> None:
+        db = self._get_db()
+        column = collections.namedtuple('column', ['name'])
+        cur = unittest.mock.MagicMock()
+        cur.description = [column('k1'), column('k2')]
+        cur.__iter__.return_value = iter([('a', 1), ('b', 2)])
+        with unittest.mock.patch.object(db, '_exec', return_value=cur):
+            res = db.read_q('SELECT * FROM t1')
+
+        self.assertEqual(res, [{'k1': 'a', 'k2': 1}, {'k1': 'b', 'k2': 2}])
+        cur.fetchall.assert_not_called()
@@ -221,6 +221,9 @@ class TestDB(DB):
 
         return ret
 
+    def read_flat_multi(self, tables: Sequence[str], where: Optional[WhereParam] = None) -> dict[str, ResultsDict]:
+        return {table: self.read_flat(table, where) for table in tables}
+
     def table_exists(self, table: str) -> bool:
         return table in self._columns
 
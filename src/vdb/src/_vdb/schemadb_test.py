@@ -62,6 +62,12 @@ class TableT1_MissingField:
     empty: Optional[int]
 
 
+@dc.dataclass
+class TableT2:
+    id: int
+    names: list[str]
+
+
 class DBTestSchema(unittest.TestCase):
     _insert_data: ParamDict
 
@@ -108,3 +114,12 @@ class DBTestSchema(unittest.TestCase):
             t1.update({'id': 2}, {'mail': True})
         with self.assertRaises(RowNotLikeSchemaError):
             t1.delete({'mail': False})
+
+    def test_schema_list(self) -> None:
+        self._db.set_data('t2', ('id', 'names'), [(1, ['a', 'b'])])
+        t2 = self._db.get_table('t2', TableT2)
+        self.assertEqual(t2.read_flat(), [TableT2(id=1, names=['a', 'b'])])
+        with self.assertRaises(RowNotLikeSchemaError):
+            t2.update({'names': ['a', 1]}, {'id': 1})
+        with self.assertRaises(RowNotLikeSchemaError):
+            t2.update({'id': [1]}, {'id': 1})
@@ -19,14 +19,56 @@ from typing import get_args, get_origin, get_type_hints
 from .db import DB0
 from .common import OrderParam, ResultDict, ResultsDict, ParamDict, SupportedTypes, ValueParam, VDBError, WhereParam
 
+import functools
 import dataclasses as dc
 
 TSchema = TypeVar('TSchema')
 
 
+@functools.lru_cache(maxsize=None)
+def _schema_hints(schema: type) -> dict[str, object]:
+    """Returns the resolved type hints of a schema. Cached since there is only a handful of schemas."""
+    return get_type_hints(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_fields(schema: type) -> frozenset[str]:
+    """Returns the field names of a schema, for checking rows against it."""
+    return frozenset(schema.__annotations__.keys())
+
+
+def _isinstance_arg(annotation: object) -> object:
+    """Flattens a Union/Optional annotation to a tuple of classes, which isinstance() checks faster."""
+    if get_origin(annotation) is Union:
+        return get_args(annotation)
+    return annotation
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_checks(schema: type) -> dict[str, tuple[object, Optional[tuple]]]:
+    """Returns the per-field type checks of a schema, resolved once instead of for every value of every row.
+
+    Each field maps to the isinstance() argument for plain values and to the allowed item types for list values, or
+    None if the field doesn't accept lists.
+    """
+    hints = _schema_hints(schema)  # type: ignore
+    ret: dict[str, tuple[object, Optional[tuple]]] = {}
+    for k, annotation in schema.__annotations__.items():
+        origin = get_origin(hints[k])
+        if isinstance(origin, type) and issubclass(list, origin):
+            items: Optional[tuple] = get_args(hints[k])
+        else:
+            items = None
+        ret[k] = (_isinstance_arg(annotation), items)
+    return ret
+
+
 class Schema:
     """Helper that instantiates derived dataclasses from a dictionary."""
 
+    # Let derived dataclasses use slots
+    __slots__ = ()
+
     # Derived classes can override this to transform the read dictionary to a dataclass-compatible one
     @classmethod
     def transform_data(cls, data: ParamDict) -> ValueParam:  # dict[str, object]:
@@ -70,26 +112,26 @@ class Table(Generic[TSchema]):
     def _check_schema(self, dt: Optional[ValueParam]) -> None:
         if dt is None:
             return
-        row_fields = set(dt.keys())
-        schema_fields = set(self.schema.__annotations__.keys())
-        if row_fields - schema_fields:
-            raise RowNotLikeSchemaError(self.table, f'Unhandled fields: {row_fields - schema_fields}')
+        unhandled = dt.keys() - _schema_fields(self.schema)  # type: ignore
+        if unhandled:
+            raise RowNotLikeSchemaError(self.table, f'Unhandled fields: {unhandled}')
+        hints = _schema_hints(self.schema)  # type: ignore
+        checks = _schema_checks(self.schema)  # type: ignore
         for k, v in dt.items():
             badfield = False
-            hints = get_type_hints(self.schema)
+            instance_of, list_items = checks[k]
 
             # For lists we can't use instance(). Do it manually and check every item
             if isinstance(v, list):
-                origin = get_origin(hints[k])
-                if origin is None or not issubclass(list, origin):
+                if list_items is None:
                     badfield = True
                 else:
                     for item in v:
-                        if not isinstance(item, get_args(hints[k])):
+                        if not isinstance(item, list_items):
                             raise RowNotLikeSchemaError(self.table,
                                                         f'List item for field {k} is not of type "{hints[k]}": {item}')
             # TODO: Do the same for dicts
-            elif not isinstance(v, self.schema.__annotations__[k]):
+            elif not isinstance(v, instance_of):  # type: ignore
                 badfield = True
 
             if badfield:
@@ -123,6 +165,10 @@ class Table(Generic[TSchema]):
         r = self.db.read_q(query, args)
         return self._resultsdict_to_schemalist(r)
 
+    def from_results(self, results: ResultsDict) -> list[TSchema]:
+        """Converts rows of this table that were read by other means, like DB0.read_flat_multi()."""
+        return self._resultsdict_to_schemalist(results)
+
     def read_one(self, where: WhereParam, sort: Optional[OrderParam] = None) -> Optional[TSchema]:
         self._check_schema(where)
         r = self.db.read_one(self.table, where, sort)
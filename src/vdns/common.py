@@ -15,6 +15,7 @@
 
 import logging
 import datetime
+import functools
 import ipaddress
 import dataclasses as dc
 
@@ -73,19 +74,20 @@ def reverse_name(net: str) -> str:
     return st
 
 
-@dc.dataclass
+@dc.dataclass(frozen=True)
 class FmttdReturn:
     value: str = ''
     human_readable: str = ''
 
 
+@functools.lru_cache(maxsize=256)
 def zone_fmttd(td: datetime.timedelta) -> FmttdReturn:
     """
     Format a timedelta value to something that's appropriate for
     zones
-    """
 
-    ret = FmttdReturn()
+    Cached, since zones only use a handful of distinct TTLs. The result is frozen so that it can be shared.
+    """
 
     lst = ((1, '', 'second', 'seconds'),
            (60, 'M', 'minute', 'minutes'),
@@ -107,7 +109,7 @@ def zone_fmttd(td: datetime.timedelta) -> FmttdReturn:
 
     ts_scaled = int(ts / ent[0])
     suffix = ent[1]
-    ret.value = f'{ts_scaled}{suffix}'
+    value = f'{ts_scaled}{suffix}'
 
     # Now form the human readable string
     rem = ts
@@ -131,9 +133,7 @@ def zone_fmttd(td: datetime.timedelta) -> FmttdReturn:
         if rem == 0:
             break
 
-    ret.human_readable = ', '.join(ret2)
-
-    return ret
+    return FmttdReturn(value=value, human_readable=', '.join(ret2))
 
 
 def tabify(st: str, width: int) -> str:
@@ -159,6 +159,32 @@ def tabify(st: str, width: int) -> str:
     return st + ('\t' * tabcount)
 
 
+def tabified_width(st: str, width: int) -> int:
+    """Returns the column that tabify(st, width) ends at, without expanding the tabs.
+
+    Equivalent to len(tabify(st, width).expandtabs()) for strings that don't contain tabs.
+    """
+    assert width % 8 == 0
+    if len(st) >= width:
+        return (len(st) // 8 + 1) * 8
+    return width
+
+
+@functools.lru_cache(maxsize=256)
+def _fmt_ttl_rr(ttl: Optional[datetime.timedelta], rr: str) -> tuple[int, str, int]:
+    """Formats the TTL, class and type columns of a record.
+
+    Cached, since records only use a handful of TTL and type combinations.
+
+    @return A tuple of the width of the hostname column, the formatted columns and the width they add to the line
+    """
+    if ttl is None:
+        return 32, f'IN\t{tabify(rr, 8)}', tabified_width(rr, 8)
+
+    ttl2 = zone_fmttd(ttl).value
+    return 24, f'{tabify(ttl2, 8)}IN\t{tabify(rr, 8)}', tabified_width(ttl2, 8) + tabified_width(rr, 8)
+
+
 def fmtrecord(name: str, ttl: Optional[datetime.timedelta], rr: str, data: str,
               multiline_data: Sequence[str] = (), comment: Optional[str] = None) -> str:
     """Formats a record.
@@ -176,23 +202,14 @@ def fmtrecord(name: str, ttl: Optional[datetime.timedelta], rr: str, data: str,
     @return The formed entry
     """
 
-    if ttl is None:
-        ttl2 = ''
-    else:
-        t = zone_fmttd(ttl)
-        ttl2 = t.value
-
     # Make more room for the hostname if there's no ttl. Saves adding an extra tab to hostnames over 24 characters long.
-    if ttl2 != '':
-        name = tabify(name, 24)
-        ttl2 = tabify(ttl2, 8)
-    else:
-        name = tabify(name, 32)
-
-    rr = tabify(rr, 8)
+    # Keep track of the column while tabifying so that multiline data don't need to expand the tabs again.
+    namewidth, ttl_rr, column = _fmt_ttl_rr(ttl, rr)
+    column += tabified_width(name, namewidth)
+    name = tabify(name, namewidth)
 
     if multiline_data:
-        prefix = '\n' + ('\t' * ((len(name.expandtabs()) + len(ttl2.expandtabs()) + len(rr.expandtabs()) + 8) // 8))
+        prefix = '\n' + ('\t' * ((column + 8) // 8))
         data_lines = []
         if data:
             if len(multiline_data) > 1:
@@ -223,7 +240,7 @@ def fmtrecord(name: str, ttl: Optional[datetime.timedelta], rr: str, data: str,
         if comment:
             data = f'{data} ; {comment}'
 
-    ret = f'{name}{ttl2}IN\t{rr}{data}'
+    ret = f'{name}{ttl_rr}{data}'
 
     return ret
 
@@ -314,31 +331,35 @@ def abort(reason: str) -> NoReturn:
     raise AbortError(reason, excode=1, error_shown=True)
 
 
-def _validate_value_type(value: Any, expected: Sequence[Type]) -> bool:
-    """Implements strict type checking (no subclasses).
+def _accepted_types(expected: Sequence[Type]) -> frozenset[Type]:
+    """Returns the exact types that match any of the expected types, expanding Optional/Union.
 
-    It addresses the problem of ipaddress.IPv4Address being an instance of ipaddress.IPv4Network.
+    Used for strict type checking (no subclasses). It addresses the problem of ipaddress.IPv4Address being an instance
+    of ipaddress.IPv4Network.
 
     May need to be relaxed and only check equality when comparing ipaddress classes.
     """
-
+    ret: set[Type] = set()
     for entry in expected:
         if get_origin(entry) is None:
-            if type(value) == entry:  # pylint: disable=unidiomatic-typecheck
-                return True
-            continue
-        if _validate_value_type(value, get_args(entry)):
-            return True
-    return False
+            ret.add(entry)
+        else:
+            ret |= _accepted_types(get_args(entry))
+    return frozenset(ret)
+
+
+@functools.lru_cache(maxsize=None)
+def _dataclass_checks(cls: type) -> tuple[tuple[dc.Field, frozenset[Type]], ...]:
+    """Returns the fields of a dataclass along with the types that they accept. Cached since it only depends on the
+    class and validate_dataclass() runs for every record."""
+    return tuple((field, _accepted_types([field.type])) for field in dc.fields(cls))
 
 
 def validate_dataclass(d: object) -> None:
-    assert dc.is_dataclass(d)
-    fields = dc.fields(d)
-    for field in fields:
+    # No dc.is_dataclass() check per call. dc.fields() raises for non-dataclasses the first time a type is seen.
+    for field, accepted in _dataclass_checks(type(d)):  # type: ignore
         value = getattr(d, field.name)
-        isok = _validate_value_type(value, [field.type])
-        if not isok:
+        if type(value) not in accepted:
             raise DataclassValidationError(field, value, d)
 
 
@@ -88,6 +88,12 @@ class CommonTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             vdns.common.zone_fmttd(datetime.timedelta(0))
 
+    def test_fmttd_cached(self) -> None:
+        ret = vdns.common.zone_fmttd(datetime.timedelta(hours=1))
+        self.assertIs(vdns.common.zone_fmttd(datetime.timedelta(seconds=3600)), ret)
+        with self.assertRaises(dc.FrozenInstanceError):
+            ret.value = '1D'  # type: ignore
+
     @parameterized.parameterized.expand([
         param('host', 'A', '10.1.1.1', 'host IN A 10.1.1.1'),
         param('host', 'A', '10.1.1.1', 'host 1D IN A 10.1.1.1', ttl=td_1d),
@@ -164,6 +170,18 @@ class CommonTest(unittest.TestCase):
     def test_tabify(self, st: str, width: int, out: str) -> None:
         self.assertEqual(vdns.common.tabify(st, width), out)
 
+    @parameterized.parameterized.expand([
+        ('test', 8),
+        ('test', 24),
+        ('', 8),
+        ('12345678', 8),
+        ('12345678', 16),
+        ('very-very-very-long-hostname', 24),
+        ('very-very-very-long-hostname', 32),
+    ])
+    def test_tabified_width(self, st: str, width: int) -> None:
+        self.assertEqual(vdns.common.tabified_width(st, width), len(vdns.common.tabify(st, width).expandtabs()))
+
     def test_tabify_bad(self) -> None:
         with self.assertRaises(Exception):
             vdns.common.tabify('test', 15)
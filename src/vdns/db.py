@@ -22,7 +22,7 @@ import vdns.vdb
 import vdns.util.config
 import vdns.common
 
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 _db: Optional['DB'] = None
 
@@ -41,6 +41,14 @@ class _Config:
     dbport: int = 5432
 
 
+@dc.dataclass
+class DynamicContext:
+    """The db entries that dynamic zones need."""
+    domain: db_tables.Domain
+    network: Optional[db_tables.Network]
+    dynamic: list[db_tables.Dynamic]
+
+
 DBReadRow = dict[str, Any]
 DBReadResults = list[DBReadRow]
 QueryArgs = dict[str, Any]
@@ -118,6 +126,63 @@ class DB:
         assert self.db is not None
         self.db.exec(query, args)
 
+    def store_serials(self, serials: Sequence[tuple[str, int]]) -> None:
+        """
+        Batch version of store_serial(), for storing the serials of many domains with a single query
+
+        @param serials  A list of (domain, serial) tuples
+        """
+        query = """UPDATE domains SET serial=data.serial, ts=domains.updated
+            FROM unnest(%(domains)s::varchar[], %(serials)s::integer[]) AS data(name, serial)
+            WHERE domains.name=data.name"""
+        args: vdns.vdb.WhereParam = {'domains': [x[0] for x in serials], 'serials': [x[1] for x in serials]}
+
+        assert self.db is not None
+        self.db.exec(query, args)
+
+    def domain_changed(self, domain: str) -> Optional[bool]:
+        """
+        Has a domain changed since its serial was last stored?
+
+        Compares updated with ts in the db, instead of reading the whole domains row. Like the serial, the
+        comparison has a resolution of one second.
+
+        @return True if updated is newer than ts, False if not, None if there is no such domain
+        """
+        query = """SELECT COALESCE(date_trunc('second', updated) > date_trunc('second', ts), updated IS NOT NULL)
+            AS changed FROM domains WHERE name=%(domain)s"""
+        args: vdns.vdb.WhereParam = {'domain': domain}
+
+        assert self.db is not None
+        res = self.db.read_q(query, args)
+        if not res:
+            return None
+        return bool(res[0]['changed'])
+
+    def changed_domains(self, domains: Sequence[str]) -> set[str]:
+        """
+        Batch version of domain_changed(), for checking many domains with a single query
+
+        @return The names of the domains that have changed. Unknown domains are not included.
+        """
+        query = """SELECT name FROM domains WHERE name = ANY(%(domains)s)
+            AND COALESCE(date_trunc('second', updated) > date_trunc('second', ts), updated IS NOT NULL)"""
+        args: vdns.vdb.WhereParam = {'domains': list(domains)}
+
+        assert self.db is not None
+        res = self.db.read_q(query, args)
+        return {str(x['name']) for x in res}
+
+    def read_domain_tables(self, domain: str, tables: Sequence[Table]) -> list[list[Any]]:
+        """
+        Read the entries of a domain from multiple tables with a single query
+
+        @return A list with the entries of each table, in the same order as tables
+        """
+        assert self.db is not None
+        res = self.db.read_flat_multi([x.table for x in tables], {'domain': domain})
+        return [x.from_results(res[x.table]) for x in tables]
+
     def is_dynamic(self, domain: str) -> bool:
         """
         Is this a domain with dynamic entries?
@@ -127,6 +192,43 @@ class DB:
         res = self.dynamic.read_one({'domain': domain})
         return bool(res)
 
+    def get_dynamic_context(self, domain: str) -> Optional[DynamicContext]:
+        """
+        Return the entries that dynamic zones need, with a single prepared query
+
+        @return The domain, its network entry (if any) and its dynamic entries, or None if the domain doesn't exist
+                or has no dynamic entries
+        """
+        query = """SELECT d.*,
+                ARRAY(SELECT network FROM networks WHERE networks.domain = d.name) AS _networks,
+                ARRAY(SELECT hostname FROM dynamic WHERE dynamic.domain = d.name) AS _dynamic
+            FROM domains d
+            WHERE d.name = %(domain)s"""
+        args: vdns.vdb.WhereParam = {'domain': domain}
+
+        assert self.db is not None
+        res = self.db.read_prepared(query, args)
+        if not res:
+            return None
+
+        row = res[0]
+        networks: Any = row.pop('_networks')
+        dynamic: Any = row.pop('_dynamic')
+
+        # Same as the db source
+        if len(networks) > 1:
+            raise vdns.vdb.VDBError(f'Found more than one network entries for {domain}')
+
+        if not dynamic:
+            return None
+
+        dom = self.domains.from_results([row])[0]
+        net = None
+        if networks:
+            net = self.networks.from_results([{'domain': dom.name, 'network': networks[0]}])[0]
+        dyn = self.dynamic.from_results([{'domain': dom.name, 'hostname': x} for x in dynamic])
+        return DynamicContext(domain=dom, network=net, dynamic=dyn)
+
     def get_subdomains(self, domain: str) -> list[db_tables.Domain]:
         """
         Return the direct subdomain records of a domain
@@ -187,6 +289,12 @@ def handle_args(args: argparse.Namespace) -> None:
 
 
 def init_db() -> DB:
+    """
+    Connect to the database
+
+    The connection is shared by everything in the process through get_db(), so it is only established once.
+    Calling this again closes the existing connection and reconnects.
+    """
     global _db
 
     if _db is not None:
@@ -205,6 +313,11 @@ def init_db() -> DB:
 
 
 def get_db() -> DB:
+    """
+    Returns the shared database connection, as created by init_db()
+
+    Sources call this on construction, so they all reuse the same connection instead of opening their own.
+    """
     if _db is None:
         raise NoDatabaseConnectionError()
 
@@ -28,7 +28,7 @@ Cidr = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
 Timpestamp = datetime.datetime
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class CName(Schema):
     domain: str
     hostname: str
@@ -36,7 +36,7 @@ class CName(Schema):
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class DKIM(Schema):
     domain: str
     hostname: str
@@ -50,7 +50,7 @@ class DKIM(Schema):
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class DNSSEC(Schema):
     id: Optional[int]
     domain: str
@@ -76,7 +76,7 @@ class DNSSEC(Schema):
         return ret  # type: ignore
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class Domain(Schema):
     name: str
     reverse: Optional[bool]
@@ -92,13 +92,13 @@ class Domain(Schema):
     updated: Optional[datetime.datetime]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class Dynamic(Schema):
     domain: str
     hostname: str
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class Host(Schema):
     ip: Inet
     domain: str
@@ -107,7 +107,7 @@ class Host(Schema):
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class MX(Schema):
     domain: str
     hostname: str
@@ -116,20 +116,20 @@ class MX(Schema):
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class Network(Schema):
     domain: str
     network: Cidr
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class NS(Schema):
     domain: str
     ns: str
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class SRV(Schema):
     domain: str
     name: str
@@ -142,7 +142,7 @@ class SRV(Schema):
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class SSHFP(Schema):
     domain: str
     hostname: str
@@ -152,7 +152,7 @@ class SSHFP(Schema):
     ttl: Optional[Interval]
 
 
-@dc.dataclass
+@dc.dataclass(slots=True)
 class TXT(Schema):
     domain: str
     hostname: str
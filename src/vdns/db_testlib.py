@@ -19,6 +19,7 @@ import datetime
 import ipaddress
 
 import vdns.db
+import vdns.vdb
 import vdns.common
 import vdns.db_tables
 
@@ -103,6 +104,36 @@ class DB(vdns.db.DB):
     def close(self) -> None:
         pass
 
+    def store_serials(self, serials: Sequence[tuple[str, int]]) -> None:
+        for domain, serial in serials:
+            dom = self.domains.read_one({'name': domain})
+            if dom is not None:
+                self.domains.update({'serial': serial, 'ts': dom.updated}, {'name': domain})  # type: ignore
+
+    def domain_changed(self, domain: str) -> Optional[bool]:
+        dom = self.domains.read_one({'name': domain})
+        if dom is None:
+            return None
+        if dom.updated is None:
+            return False
+        return dom.ts is None or dom.updated.replace(microsecond=0) > dom.ts.replace(microsecond=0)
+
+    def changed_domains(self, domains: Sequence[str]) -> set[str]:
+        return {x for x in domains if self.domain_changed(x)}
+
+    def get_dynamic_context(self, domain: str) -> Optional[vdns.db.DynamicContext]:
+        dom = self.domains.read_one({'name': domain})
+        if dom is None:
+            return None
+        networks = self.networks.read_flat({'domain': domain})
+        if len(networks) > 1:
+            raise vdns.vdb.VDBError(f'Found more than one network entries for {domain}')
+        dynamic = self.dynamic.read_flat({'domain': domain})
+        if not dynamic:
+            return None
+        network = networks[0] if networks else None
+        return vdns.db.DynamicContext(domain=dom, network=network, dynamic=dynamic)
+
     def get_subdomains(self, domain: str) -> list[vdns.db_tables.Domain]:
         res = self.domains.read_flat()
         matching_domains = [x for x in res if x.name.endswith(f'.{domain}')]
@@ -17,10 +17,12 @@
 
 import typing
 import datetime
+import ipaddress
 import unittest
 
 from vdns import db_testlib
 import vdns.db
+import vdns.vdb
 
 from typing import Optional
 
@@ -57,3 +59,58 @@ class TestlibTest(unittest.TestCase):
         self.assertFalse(self._db.is_dynamic('unknowndomain'))
         self.assertFalse(self._db.is_dynamic('dom1'))
         self.assertTrue(self._db.is_dynamic('dyn.v13.gr'))
+
+    def test_get_dynamic_context(self) -> None:
+        self.assertIsNone(self._db.get_dynamic_context('unknowndomain'))
+        self.assertIsNone(self._db.get_dynamic_context('v13.gr'))
+
+        ctx = self._db.get_dynamic_context('dyn.v13.gr')
+        assert ctx is not None
+        self.assertEqual(ctx.domain.name, 'dyn.v13.gr')
+        self.assertIsNone(ctx.network)
+        self.assertEqual([x.hostname for x in ctx.dynamic], ['host1'])
+
+        # Always current
+        self._db.store_serials([('dyn.v13.gr', 2022060421)])
+        ctx2 = self._db.get_dynamic_context('dyn.v13.gr')
+        assert ctx2 is not None
+        self.assertEqual(ctx2.domain.serial, 2022060421)
+
+    def test_get_dynamic_context_networks(self) -> None:
+        self._db.add_data_tuple('networks', [('dyn.v13.gr', ipaddress.ip_network('10.9.0.0/16'))])
+        ctx = self._db.get_dynamic_context('dyn.v13.gr')
+        assert ctx is not None and ctx.network is not None
+        self.assertEqual(ctx.network.network, ipaddress.ip_network('10.9.0.0/16'))
+
+        # Same as the db source
+        self._db.add_data_tuple('networks', [('dyn.v13.gr', ipaddress.ip_network('10.10.0.0/16'))])
+        with self.assertRaises(vdns.vdb.VDBError):
+            self._db.get_dynamic_context('dyn.v13.gr')
+
+    def test_store_serials(self) -> None:
+        self._db.store_serials([('v13.gr', 2022060401), ('sub.v13.gr', 2022060402), ('unknowndomain', 1)])
+        self.assertEqual({x.name: x.serial for x in self._db.domains.read_flat()}, {
+            'v13.gr': 2022060401,
+            'dyn.v13.gr': 2022060420,
+            'sub.v13.gr': 2022060402,
+            '10.in-addr.arpa': 2022060400,
+            '8.b.d.0.1.0.0.2.ip6.arpa': 2022060400,
+        })
+
+    def test_domain_changed(self) -> None:
+        self.assertIsNone(self._db.domain_changed('unknowndomain'))
+        # updated is not set in the test data
+        self.assertFalse(self._db.domain_changed('v13.gr'))
+
+        dom = self._db.domains.read_one({'name': 'v13.gr'})
+        assert dom is not None and dom.ts is not None
+        # Sub-second differences don't count
+        ts = dom.ts.replace(microsecond=0)
+        self._db.domains.update({'ts': ts, 'updated': ts + datetime.timedelta(microseconds=500000)},  # type: ignore
+                                {'name': 'v13.gr'})
+        self.assertFalse(self._db.domain_changed('v13.gr'))
+        self.assertEqual(self._db.changed_domains(['v13.gr']), set())
+
+        self._db.domains.update({'updated': ts + datetime.timedelta(seconds=1)}, {'name': 'v13.gr'})  # type: ignore
+        self.assertTrue(self._db.domain_changed('v13.gr'))
+        self.assertEqual(self._db.changed_domains(['v13.gr', 'dyn.v13.gr', 'unknowndomain']), {'v13.gr'})
@@ -13,10 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict, Generic, Optional, Protocol, Sequence, Type, TypeVar, Union
+from typing import Any, ClassVar, Dict, Generic, Optional, Protocol, Sequence, Type, TypeVar, Union
 
+import sys
 import enum
 import datetime
+import functools
+import itertools
 import ipaddress
 import dataclasses as dc
 
@@ -46,8 +49,57 @@ class ParseError(Exception):
         super().__init__(f'{msg}. addr1="{r.addr1}, addr2={r.addr2}')
 
 
+def _has_n_dots(st: str, n: int) -> bool:
+    """Returns True if st contains at least n dots. Stops scanning once the n-th dot is found."""
+    idx = -1
+    while n > 0:
+        idx = st.find('.', idx + 1)
+        if idx < 0:
+            return False
+        n -= 1
+    return True
+
+
+# The reversed, dot-separated nibbles of every byte value, for building ip6.arpa names
+_NIBBLE_PAIRS: tuple[str, ...] = tuple(f'{x & 0xf:x}.{x >> 4:x}' for x in range(256))
+
+
+def _reverse_pointer(ip: vdns.common.IPAddress) -> str:
+    """Same as ip.reverse_pointer, but formats the address directly from its packed form."""
+    b = ip.packed
+    if ip.version == 4:
+        return f'{b[3]}.{b[2]}.{b[1]}.{b[0]}.in-addr.arpa'
+    return '.'.join([_NIBBLE_PAIRS[x] for x in reversed(b)]) + '.ip6.arpa'
+
+
+@functools.lru_cache(maxsize=4096)
+def _ip_str(ip: vdns.common.IPAddress) -> str:
+    """Cached ip.compressed, which ipaddress rebuilds on every access. The same addresses get rendered more than once,
+    e.g. as glue records, and IPv6 formatting is particularly slow."""
+    return ip.compressed
+
+
+@functools.lru_cache(maxsize=None)
+def _field_tuple(rrtype: type) -> tuple[str, ...]:
+    """Returns the field names of a dataclass type in definition order. Cached since there is only a handful of types."""
+    return tuple(x.name for x in dc.fields(rrtype))
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(rrtype: type) -> frozenset[str]:
+    """Same as _field_tuple() but as a set, for membership tests."""
+    return frozenset(_field_tuple(rrtype))
+
+
+def _shallow_dict(obj: Any) -> dict[str, Any]:
+    """Like dc.asdict() but without deep-copying the values. RR and db schema fields are immutable, so sharing is fine."""
+    return {name: getattr(obj, name) for name in _field_tuple(type(obj))}  # type: ignore
+
+
 class _StringRecord:
     """Holds the resulting RR string, plus a few related information. Used as a return type for make_string()."""
+    __slots__ = ('st', 'multiline_st', 'comment', 'hostname', 'rrname', 'autodot', '_needsdot')
+
     st: str
     multiline_st: Sequence[str]
     comment: str
@@ -73,15 +125,14 @@ class _StringRecord:
         if self._needsdot is not None:
             return self._needsdot
 
-        return self.autodot > 0 and self.st.count('.') >= self.autodot
+        return self.autodot > 0 and _has_n_dots(self.st, self.autodot)
 
     @needsdot.setter
     def needsdot(self, value: bool) -> None:
-        if not isinstance(value, property):
-            self._needsdot = value
+        self._needsdot = value
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class RR(Generic[TSchema]):
     """
     There are three hostnames:
@@ -97,6 +148,8 @@ class RR(Generic[TSchema]):
 
     def __post_init__(self) -> None:
         self.validate()
+        # All records of a zone share the same domain, so don't keep a copy of it per record
+        self.domain = sys.intern(self.domain)
 
     # To be reusable after overriding the rrname property
     def _rrname(self) -> str:
@@ -108,52 +161,58 @@ class RR(Generic[TSchema]):
 
     @property
     def rrfields(self) -> list[str]:
-        return [x.name for x in dc.fields(self)]
+        return list(_field_tuple(type(self)))  # type: ignore
 
     def validate(self) -> None:
         vdns.common.validate_dataclass(self)
 
     def make_string(self, records: Sequence[_StringRecord]) -> str:
-        ret = ''
+        lines: list[str] = []
+        fmtrecord = vdns.common.fmtrecord
+        ttl = self.ttl
 
-        assert isinstance(records, Sequence)
-        assert all(isinstance(x, _StringRecord) for x in records)
+        # Defaults for records that don't override them
+        default_hostname = self.cooked_hostname
+        if default_hostname == '.' or default_hostname is None:
+            default_hostname = ''
+        default_rrname = self.rrname
 
         for rec in records:
             if not rec.st and not rec.multiline_st:
                 raise BadRecordError('Record is missing the data', self)
 
-            if rec.multiline_st and rec.needsdot:
+            needsdot = rec.needsdot
+            if rec.multiline_st and needsdot:
                 raise BadRecordError('Cannot use needsdot with multiline strings', self)
 
-            if rec.needsdot and rec.st[-1] != '.':
-                rec.st += '.'
+            st = rec.st
+            if needsdot and not st.endswith('.'):
+                st += '.'
 
             if rec.hostname is None:
-                hostname = self.cooked_hostname
+                hostname = default_hostname
+            elif rec.hostname == '.':
+                hostname = ''
             else:
                 hostname = rec.hostname
 
-            if hostname == '.' or hostname is None:
-                hostname = ''
+            rrname = rec.rrname or default_rrname
 
-            rrname = rec.rrname if rec.rrname else self.rrname
+            lines.append(fmtrecord(hostname, ttl, rrname, st, rec.multiline_st, rec.comment))
 
-            ret += vdns.common.fmtrecord(hostname, self.ttl, rrname, rec.st, rec.multiline_st, rec.comment)
-            ret += '\n'
+        if not lines:
+            return ''
+        return '\n'.join(lines) + '\n'
 
-        return ret
-
-    def _records(self) -> Union[_StringRecord, list[_StringRecord]]:
+    def _records(self) -> tuple[_StringRecord, ...]:
         raise NotImplementedError
 
     def record(self) -> str:
-        self.validate()
-        records = self._records()
-        if not isinstance(records, Sequence):
-            records = [records]
-
-        return self.make_string(records)
+        # Records are validated on construction. Re-validating here only catches fields that were changed since, which
+        # is a programming error, so skip it under "python -O".
+        if __debug__:
+            self.validate()
+        return self.make_string(self._records())
 
     @classmethod
     def parse_line(cls: Type[T], domain: str, r: ParseLineInput) -> T:
@@ -164,18 +223,10 @@ class RR(Generic[TSchema]):
         return self.cooked_hostname
 
     def __lt__(self, other: 'RR') -> bool:
-        if self.sort_key is None:
-            return True
-        if other.sort_key is None:
-            return False
-        return self.sort_key < other.sort_key
+        return rr_sort_key(self) < rr_sort_key(other)
 
     def __gt__(self, other: 'RR') -> bool:
-        if self.sort_key is None:
-            return False
-        if other.sort_key is None:
-            return True
-        return self.sort_key > other.sort_key
+        return rr_sort_key(self) > rr_sort_key(other)
 
     @property
     def associated_hostname(self) -> Optional[str]:
@@ -196,11 +247,11 @@ class RR(Generic[TSchema]):
 
         Can be overridden by children.
         """
-        return dc.asdict(dbdata)
+        return _shallow_dict(dbdata)
 
     @classmethod
     def from_db_record(cls: Type[T], dbdata: TSchema) -> T:
-        assert dc.is_dataclass(dbdata)
+        # _shallow_dict() fails for non-dataclasses, so there is no need to check for every row
         dbdict = cls._from_db_record(dbdata)
         return cls(**dbdict)
 
@@ -209,28 +260,34 @@ class RR(Generic[TSchema]):
 
         Can be overridden by children.
         """
-        return dc.asdict(self)
+        return _shallow_dict(self)
 
     def to_db_record(self, record_type: Type[TSchema]) -> TSchema:
-        dbfields = [x.name for x in dc.fields(record_type)]
+        dbfields = _field_names(record_type)  # type: ignore
         dt = self._to_db_dict()
-        diff = set(dt.keys()) - set(dbfields)
+        diff = dt.keys() - dbfields
         if diff:
             missing = ', '.join(diff)
             raise Exception(f'Fields missing from db schema for {self.__class__} -> {record_type}: {missing}')
         return record_type(**dt)
 
 
-@dc.dataclass(kw_only=True)
+def rr_sort_key(rec: RR) -> tuple[bool, Any]:
+    """Returns a key for sorting records. Records without a sort_key are placed first.
+
+    Use it with sorted(key=...) so that each sort_key is computed once instead of once per comparison.
+    """
+    key = rec.sort_key
+    return (key is not None, key)
+
+
+@dc.dataclass(kw_only=True, slots=True)
 class MX(RR):
     priority: int
     mx: str
 
-    def _records(self) -> _StringRecord:
-        ret = _StringRecord(f'{self.priority:<4} {self.mx}')
-        if self.mx.count('.') >= 2:
-            ret.needsdot = True
-        return ret
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(f'{self.priority:<4} {self.mx}', needsdot=_has_n_dots(self.mx, 2)),)
 
     @classmethod
     def parse_line(cls, domain: str, r: ParseLineInput) -> 'MX':
@@ -240,15 +297,12 @@ class MX(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class NS(RR):
     ns: str
 
-    def _records(self) -> _StringRecord:
-        ret = _StringRecord(self.ns)
-        if self.ns.count('.') >= 2:
-            ret.needsdot = True
-        return ret
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(self.ns, needsdot=_has_n_dots(self.ns, 2)),)
 
     @classmethod
     def parse_line(cls, domain: str, r: ParseLineInput) -> 'NS':
@@ -257,31 +311,34 @@ class NS(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class Host(RR):
     ip: vdns.common.IPAddress
     reverse: Optional[bool]
 
+    _RRNAME: ClassVar[dict[int, str]] = {4: 'A', 6: 'AAAA'}
+
     @property
     def rrname(self) -> str:
-        if self.ip.version == 4:
-            return 'A'
-        if self.ip.version == 6:
-            return 'AAAA'
-        raise BadRecordError('Unsupported IP version', self)
+        try:
+            return self._RRNAME[self.ip.version]
+        except KeyError:
+            raise BadRecordError('Unsupported IP version', self) from None
 
-    def _records(self) -> _StringRecord:
-        return _StringRecord(self.ip.compressed)
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(_ip_str(self.ip)),)
 
     @property
     def as_ipv6(self) -> ipaddress.IPv6Address:
         if self.ip.version == 6:
             return self.ip
-        return ipaddress.IPv6Address(f'::{self.ip.compressed}')
+        # Same as ::a.b.c.d, without parsing a string
+        return ipaddress.IPv6Address(int(self.ip))
 
     @property
     def sort_key(self) -> Any:
-        return self.as_ipv6
+        # Sorts the same as as_ipv6, without constructing it
+        return int(self.ip)
 
     @classmethod
     def parse_line(cls, domain: str, r: ParseLineInput) -> 'Host':
@@ -291,19 +348,19 @@ class Host(RR):
 
     @classmethod
     def _from_db_record(cls, dbdata: vdns.db_tables.Host) -> dict[str, Any]:
-        ret = dc.asdict(dbdata)
+        ret = _shallow_dict(dbdata)
         if ret['ip']:
             ret['ip'] = dbdata.ip.ip
         return ret
 
     def _to_db_dict(self) -> dict[str, Any]:
-        ret = dc.asdict(self)
+        ret = _shallow_dict(self)
         if ret['ip']:
             ret['ip'] = ipaddress.ip_interface(self.ip)
         return ret
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class PTR(Host):
     net_domain: str
 
@@ -313,13 +370,13 @@ class PTR(Host):
 
     @property
     def cooked_hostname(self) -> Optional[str]:
-        rev = self.ip.reverse_pointer
+        rev = _reverse_pointer(self.ip)
+        suffix = f'.{self.net_domain}'
         # sanity check
-        assert rev.endswith(f'.{self.net_domain}'), f"'{rev}' doesn't end with '{self.net_domain}'"
-        hostname = rev.removesuffix(f'.{self.net_domain}')
-        return hostname
+        assert rev.endswith(suffix), f"'{rev}' doesn't end with '{self.net_domain}'"
+        return rev.removesuffix(suffix)
 
-    def _records(self) -> _StringRecord:
+    def _records(self) -> tuple[_StringRecord, ...]:
         if self.hostname:
             data = f'{self.hostname}.{self.domain}'
         else:
@@ -330,15 +387,16 @@ class PTR(Host):
         if self.ip.version not in (4, 6):
             raise BadRecordError('Bad IP version', self)
 
-        return _StringRecord(data, needsdot=True)
+        return (_StringRecord(data, needsdot=True),)
 
     @classmethod
     def from_host(cls, host: Host, net_domain: str) -> 'PTR':
-        return cls(net_domain=net_domain, **dc.asdict(host))
+        return cls(net_domain=net_domain, **_shallow_dict(host))
 
     @property
     def sort_key(self) -> Any:
-        return b'%d-%b' % (self.ip.version, self.ip.packed)
+        # Sorts the same as (version, packed) since the packed form is big-endian and fixed-size per version
+        return (self.ip.version, int(self.ip))
 
     @classmethod
     def parse_line(cls: Type['PTR'], domain: str, r: ParseLineInput) -> 'PTR':
@@ -347,12 +405,12 @@ class PTR(Host):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class CNAME(RR):
     hostname0: str
 
-    def _records(self) -> _StringRecord:
-        return _StringRecord(self.hostname0, autodot=2)
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(self.hostname0, autodot=2),)
 
     @property
     def sort_key(self) -> Any:
@@ -371,13 +429,12 @@ class CNAME(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class TXT(RR):
     txt: str
 
-    def _records(self) -> _StringRecord:
-        data = f'"{self.txt}"'
-        return _StringRecord(data)
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(f'"{self.txt}"'),)
 
     # TODO: Use this and introduce a associated_hostname() property, which should be used for
     # looking up the hostname to associate entries with. This way the _spf records for hosts will be
@@ -405,7 +462,7 @@ class TXT(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class DNSSEC(RR):
     keyid: int
     ksk: bool
@@ -430,25 +487,25 @@ class DNSSEC(RR):
         ED25519 = 15
         ED448 = 16
 
-    def _records(self) -> Union[_StringRecord, list[_StringRecord]]:
+    def _records(self) -> tuple[_StringRecord, ...]:
         raise NotImplementedError
 
     @classmethod
     def _from_db_record(cls, dbdata: vdns.db_tables.DNSSEC) -> dict[str, Any]:
-        ret = dc.asdict(dbdata)
+        ret = _shallow_dict(dbdata)
         del ret['id']
         return ret
 
     def _to_db_dict(self) -> dict[str, Any]:
-        dt = dc.asdict(self)
+        dt = _shallow_dict(self)
         dt['id'] = None
         dt.pop('hostname')
         return dt
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class DNSKEY(DNSSEC):
-    def _records(self) -> _StringRecord:
+    def _records(self) -> tuple[_StringRecord, ...]:
         if self.ksk:
             flags = 257
             key_st = 'KSK'
@@ -461,12 +518,12 @@ class DNSKEY(DNSSEC):
         algo = self.Algos(self.algorithm)
         comment = f'{key_st} ; alg = {algo.name} ; key id = {self.keyid}'
 
-        return _StringRecord(data, multiline_st=multiline_data, comment=comment)
+        return (_StringRecord(data, multiline_st=multiline_data, comment=comment),)
 
     @classmethod
     def from_dnssec(cls, dnssec: DNSSEC) -> 'DNSKEY':
         """Constructs a DNSKEY class from a DNSSEC class."""
-        return DNSKEY(**dc.asdict(dnssec))
+        return DNSKEY(**_shallow_dict(dnssec))
 
     @classmethod
     def _parse_dnskey(cls, addr: str) -> 'DNSKEY':
@@ -511,18 +568,16 @@ class DNSKEY(DNSSEC):
         return ret
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class DS(DNSSEC):
-    def _records(self) -> list[_StringRecord]:
-        ret = []
-        ret.append(_StringRecord(f'{self.keyid} {self.algorithm} 1 {self.digest_sha1}'))
-        ret.append(_StringRecord(f'{self.keyid} {self.algorithm} 2 {self.digest_sha256}'))
-        return ret
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(f'{self.keyid} {self.algorithm} 1 {self.digest_sha1}'),
+                _StringRecord(f'{self.keyid} {self.algorithm} 2 {self.digest_sha256}'))
 
     @classmethod
     def from_dnssec(cls, dnssec: DNSSEC) -> 'DS':
         """Constructs a DS class from a DNSSEC class."""
-        return DS(**dc.asdict(dnssec))
+        return DS(**_shallow_dict(dnssec))
 
     @classmethod
     def parse_line(cls, domain: str, r: ParseLineInput) -> 'DS':
@@ -555,15 +610,14 @@ class DS(DNSSEC):
         return ds
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class SSHFP(RR):
     keytype: int
     hashtype: int
     fingerprint: str
 
-    def _records(self) -> _StringRecord:
-        data = f'{self.keytype} {self.hashtype} {self.fingerprint}'
-        return _StringRecord(data)
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(f'{self.keytype} {self.hashtype} {self.fingerprint}'),)
 
     @classmethod
     def parse_line(cls: Type['SSHFP'], domain: str, r: ParseLineInput) -> 'SSHFP':
@@ -574,7 +628,43 @@ class SSHFP(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+def _dkim_template(has_g: bool, has_h: bool, t: bool, subdomains: bool) -> str:
+    """Returns the %-template of the DKIM TXT data for one combination of the optional tags."""
+    if t:
+        t_flag: Optional[str] = 'y' if subdomains else 's:y'
+    elif not subdomains:
+        t_flag = 's'
+    else:
+        t_flag = None
+
+    parts = ['v=DKIM1']
+    if has_g:
+        parts.append('g=%(g)s')
+    parts += ['k=%(k)s', 's=email']
+    if t_flag is not None:
+        parts.append(f't={t_flag}')
+    if has_h:
+        parts.append('h=%(h)s')
+    parts.append('p=%(p)s')
+    return '; '.join(parts)
+
+
+# Keyed by (has_g, has_h, t, subdomains)
+_DKIM_TEMPLATES: dict[tuple[bool, bool, bool, bool], str] = {
+    (g, h, t, s): _dkim_template(g, h, t, s) for g, h, t, s in itertools.product((False, True), repeat=4)
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _split_dkim_data(data: str) -> tuple[str, ...]:
+    """Cached vdns.common.split_txt_multiline() for DKIM data, which is the same every time a key is rendered.
+
+    Cached by the data instead of per DKIM instance since records can be modified after construction.
+    """
+    return tuple(vdns.common.split_txt_multiline(data))
+
+
+@dc.dataclass(kw_only=True, slots=True)
 class DKIM(RR):
     selector: str
     k: str
@@ -584,35 +674,23 @@ class DKIM(RR):
     h: Optional[str] = None
     subdomains: bool
 
+    # DKIM data is published as a TXT record
+    _TXT: ClassVar[str] = 'TXT'
+
     @property
     def cooked_hostname(self) -> Optional[str]:
-        hostname = f'{self.selector}._domainkey'
         if self.hostname:
-            hostname += f'.{self.hostname}'
-        return hostname
-
-    def _records(self) -> _StringRecord:
-        data0 = []
-        data0.append('v=DKIM1')
-        if self.g is not None:
-            data0.append(f'g={self.g}')
-        data0.append(f'k={self.k}')
-        data0.append('s=email')
-        if self.t or not self.subdomains:
-            if self.t:
-                if self.subdomains:
-                    t = 'y'
-                else:
-                    t = 's:y'
-            else:
-                t = 's'
-            data0.append(f't={t}')
-        if self.h is not None:
-            data0.append(f'h={self.h}')
-        data0.append(f'p={self.key_pub}')
-        lines = vdns.common.split_txt_multiline('; '.join(data0))
+            return f'{self.selector}._domainkey.{self.hostname}'
+        return f'{self.selector}._domainkey'
+
+    def _records(self) -> tuple[_StringRecord, ...]:
+        g = self.g
+        h = self.h
+        template = _DKIM_TEMPLATES[(g is not None, h is not None, bool(self.t), bool(self.subdomains))]
+        data = template % {'g': g, 'h': h, 'k': self.k, 'p': self.key_pub}
+        lines = _split_dkim_data(data)
 
-        return _StringRecord(st='', multiline_st=lines, rrname='TXT')
+        return (_StringRecord(st='', multiline_st=lines, rrname=self._TXT),)
 
     @classmethod
     def _parse_dkim(cls, addr1: str, addr2: str) -> 'DKIM':
@@ -686,7 +764,7 @@ class DKIM(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass(kw_only=True)
+@dc.dataclass(kw_only=True, slots=True)
 class SRV(RR):
     class Protocol(enum.Enum):
         tcp = 1
@@ -704,15 +782,13 @@ class SRV(RR):
 
     @property
     def cooked_hostname(self) -> Optional[str]:
-        hostname = f'_{self.service}._{self.protocol}'
         if self.name:
-            hostname += f'.{self.name}'
-        return hostname
+            return f'_{self.service}._{self.protocol}.{self.name}'
+        return f'_{self.service}._{self.protocol}'
 
-    def _records(self) -> _StringRecord:
-        data = f'{self.priority} {self.weight} {self.port} {self.target}'
-        needsdot = self.target.count('.') >= 1
-        return _StringRecord(data, needsdot=needsdot)
+    def _records(self) -> tuple[_StringRecord, ...]:
+        return (_StringRecord(f'{self.priority} {self.weight} {self.port} {self.target}',
+                              needsdot=_has_n_dots(self.target, 1)),)
 
     @classmethod
     def parse_line(cls, domain: str, r: ParseLineInput) -> 'SRV':
@@ -747,7 +823,21 @@ class SRV(RR):
         # pylint: enable=unexpected-keyword-arg
 
 
-@dc.dataclass
+_SOA_TEMPLATE = '''\
+$ORIGIN\t\t\t%s.
+$TTL\t\t\t%s; %s
+@\t\t\t%sIN\tSOA\t%s. %s. (
+\t\t\t\t\t%s ; serial
+\t\t\t\t\t%s ; refresh (%s)
+\t\t\t\t\t%s ; retry (%s)
+\t\t\t\t\t%s ; expire (%s)
+\t\t\t\t\t%s ; minimum (%s)
+\t\t\t\t\t)
+
+'''
+
+
+@dc.dataclass(slots=True)
 class SOA:
     name: str = ''
     ttl: datetime.timedelta = datetime.timedelta(days=1)
@@ -760,32 +850,27 @@ class SOA:
     ns0: str = ''
 
     def record(self) -> str:
-        ttl = vdns.common.zone_fmttd(self.ttl)
-        refresh = vdns.common.zone_fmttd(self.refresh)
-        retry = vdns.common.zone_fmttd(self.retry)
-        expire = vdns.common.zone_fmttd(self.expire)
-        minimum = vdns.common.zone_fmttd(self.minimum)
-
-        ttl2 = vdns.common.tabify(ttl.value, 8)
-        serial2 = vdns.common.tabify(str(self.serial), 16)
-        refresh2 = vdns.common.tabify(refresh.value, 16)
-        retry2 = vdns.common.tabify(retry.value, 16)
-        expire2 = vdns.common.tabify(expire.value, 16)
-        minimum2 = vdns.common.tabify(minimum.value, 16)
-
-        ret = f'''\
-$ORIGIN\t\t\t{self.name}.
-$TTL\t\t\t{ttl2}; {ttl.human_readable}
-@\t\t\t{ttl2}IN	SOA	{self.ns0}. {self.contact}. (
-\t\t\t\t\t{serial2} ; serial
-\t\t\t\t\t{refresh2} ; refresh ({refresh.human_readable})
-\t\t\t\t\t{retry2} ; retry ({retry.human_readable})
-\t\t\t\t\t{expire2} ; expire ({expire.human_readable})
-\t\t\t\t\t{minimum2} ; minimum ({minimum.human_readable})
-\t\t\t\t\t)
-
-'''
-        return ret
+        zone_fmttd = vdns.common.zone_fmttd
+        tabify = vdns.common.tabify
+
+        ttl = zone_fmttd(self.ttl)
+        refresh = zone_fmttd(self.refresh)
+        retry = zone_fmttd(self.retry)
+        expire = zone_fmttd(self.expire)
+        minimum = zone_fmttd(self.minimum)
+
+        ttl2 = tabify(ttl.value, 8)
+
+        return _SOA_TEMPLATE % (
+            self.name,
+            ttl2, ttl.human_readable,
+            ttl2, self.ns0, self.contact,
+            tabify(str(self.serial), 16),
+            tabify(refresh.value, 16), refresh.human_readable,
+            tabify(retry.value, 16), retry.human_readable,
+            tabify(expire.value, 16), expire.human_readable,
+            tabify(minimum.value, 16), minimum.human_readable,
+        )
 
     def __lt__(self, other: 'SOA') -> bool:
         return self.name < other.name
@@ -795,8 +880,7 @@ $TTL\t\t\t{ttl2}; {ttl.human_readable}
 
     @classmethod
     def from_db_record(cls, dbdata: vdns.db_tables.Domain) -> 'SOA':
-        assert dc.is_dataclass(dbdata)
-        dbdict = dc.asdict(dbdata)
+        dbdict = _shallow_dict(dbdata)
         del dbdict['reverse']
         del dbdict['ts']
         del dbdict['updated']
@@ -808,7 +892,7 @@ T_RR_SOA = TypeVar('T_RR_SOA', bound=Union[RR, SOA])
 
 def make_rr(rrtype: Union[Type[T_RR_SOA]], data: Dict[Any, Any], eat: bool = True) -> T_RR_SOA:
     """Constructs an RR from a dictionary, ignoring extra entries in the dict."""
-    fields = [x.name for x in dc.fields(rrtype)]
+    fields = _field_names(rrtype)  # type: ignore
     data2 = {k: v for k, v in data.items() if not eat or k in fields}
     return rrtype(**data2)  # type: ignore
 
@@ -35,6 +35,33 @@ def clean(st: str) -> str:
     return ret
 
 
+class HelpersTest(unittest.TestCase):
+
+    def test_has_n_dots(self) -> None:
+        self.assertTrue(rr._has_n_dots('data', 0))
+        self.assertFalse(rr._has_n_dots('data', 1))
+        self.assertTrue(rr._has_n_dots('data.some', 1))
+        self.assertFalse(rr._has_n_dots('data.some', 2))
+        self.assertTrue(rr._has_n_dots('data.some.domain', 2))
+        self.assertTrue(rr._has_n_dots('a..', 2))
+
+    def test_reverse_pointer(self) -> None:
+        for st in ('10.1.2.3', '192.168.0.255', '0.0.0.0', '2001:db8::1', '2001:db8:2c1:3212::ff0a', '::'):
+            ip = ipaddress.ip_address(st)
+            self.assertEqual(rr._reverse_pointer(ip), ip.reverse_pointer)
+
+    def test_ip_str(self) -> None:
+        for st in ('10.1.2.3', '2001:db8:0:0::1', '2001:db8:2c1:3212::ff0a'):
+            ip = ipaddress.ip_address(st)
+            self.assertEqual(rr._ip_str(ip), ip.compressed)
+            self.assertIs(rr._ip_str(ipaddress.ip_address(st)), rr._ip_str(ip))
+
+    def test_rr_sort_key(self) -> None:
+        recs = [rr.TXT(domain='dom.com', hostname=x, txt='txt') for x in ('b', None, 'a', None)]
+        self.assertEqual([x.hostname for x in sorted(recs, key=rr.rr_sort_key)], [None, None, 'a', 'b'])
+        self.assertEqual([x.hostname for x in sorted(recs, key=rr.rr_sort_key)], [x.hostname for x in sorted(recs)])
+
+
 class StringRecordTest(unittest.TestCase):
 
     def test_constructor(self) -> None:
@@ -71,9 +98,24 @@ class StringRecordTest(unittest.TestCase):
         s = rr._StringRecord('data.some.domain')
         self.assertEqual(s.needsdot, False)
 
+    def test_make_string_keeps_record(self) -> None:
+        ns = rr.NS(hostname='sub', domain='dom.com', ns='ns1.google.com')
+        s = rr._StringRecord('ns1.google.com', needsdot=True)
+        rec1 = clean(ns.make_string([s]))
+        rec2 = clean(ns.make_string([s]))
+        self.assertEqual(s.st, 'ns1.google.com')
+        self.assertEqual(rec1, 'sub IN NS ns1.google.com.')
+        self.assertEqual(rec1, rec2)
+
 
 class SimpleRRTest(unittest.TestCase):
 
+    def test_domain_interned(self) -> None:
+        domain = ''.join(['dom', '.com'])
+        mx = rr.MX(domain=domain, priority=10, mx='mx1')
+        ns = rr.NS(domain=''.join(['dom', '.com']), ns='ns1')
+        self.assertIs(mx.domain, ns.domain)
+
     def test_mx(self) -> None:
         mx = rr.MX(hostname='mail', domain='dom.com', ttl=datetime.timedelta(seconds=3600),
                    priority=10, mx='mx1')
@@ -102,6 +144,19 @@ class SimpleRRTest(unittest.TestCase):
         rec = clean(host.record())
         self.assertEqual(rec, 'srv1 1H IN A 10.1.1.2')
 
+    def test_host_sort_key(self) -> None:
+        ips = [ipaddress.ip_address(x) for x in ('10.1.1.2', '2001:db8::1', '10.1.1.1', '::1', '192.168.0.1')]
+        hosts = [rr.Host(domain='dom.com', hostname='h', ip=x, reverse=True) for x in ips]
+        for host in hosts:
+            self.assertEqual(host.as_ipv6, ipaddress.IPv6Address(f'::{host.ip.compressed}')
+                             if host.ip.version == 4 else host.ip)
+        self.assertEqual([x.ip for x in sorted(hosts, key=lambda x: x.sort_key)],
+                         [x.ip for x in sorted(hosts, key=lambda x: x.as_ipv6)])
+
+        ptrs = [rr.PTR.from_host(x, 'in-addr.arpa' if x.ip.version == 4 else 'ip6.arpa') for x in hosts]
+        self.assertEqual([x.ip for x in sorted(ptrs, key=lambda x: x.sort_key)],
+                         [x.ip for x in sorted(ptrs, key=lambda x: (x.ip.version, x.ip.packed))])
+
     def test_ptr(self) -> None:
         ptr = rr.PTR(hostname='srv1', domain='dom.com', ttl=datetime.timedelta(seconds=3600),
                      ip=ipaddress.IPv4Address('10.1.1.2'), reverse=True, net_domain='1.10.in-addr.arpa')
@@ -122,6 +177,15 @@ class SimpleRRTest(unittest.TestCase):
         with self.assertRaises(rr.BadRecordError):
             ptr.record()
 
+    def test_ptr_from_host(self) -> None:
+        host = rr.Host(hostname='srv1', domain='dom.com', ttl=datetime.timedelta(seconds=3600),
+                       ip=ipaddress.IPv4Address('10.1.1.2'), reverse=True)
+        ptr = rr.PTR.from_host(host, '1.10.in-addr.arpa')
+        self.assertIs(ptr.ip, host.ip)
+        self.assertEqual(ptr.ttl, host.ttl)
+        rec = clean(ptr.record())
+        self.assertEqual(rec, '2.1 1H IN PTR srv1.dom.com.')
+
     def test_cname(self) -> None:
         ptr = rr.CNAME(hostname='ns1', domain='dom.com', ttl=datetime.timedelta(seconds=3600),
                        hostname0='srv1')
@@ -160,6 +224,10 @@ class SimpleRRTest(unittest.TestCase):
         self.assertIn('sub IN DS 10 8 1 digest_sha1', reclines)
         self.assertIn('sub IN DS 10 8 2 digest_sha256', reclines)
 
+        dnssec0 = rr.DNSSEC(**dt)
+        self.assertEqual(rr.DNSKEY.from_dnssec(dnssec0), rr.DNSKEY(**dt))
+        self.assertEqual(rr.DS.from_dnssec(dnssec0), rr.DS(**dt))
+
     def test_dkim(self) -> None:
         pubkey = 'pubkey'
         dkim = rr.DKIM(domain='dom.com', selector='google', k='rsa',
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import time
 import logging
 import vdns.db
 import vdns.rr
@@ -22,22 +21,27 @@ import vdns.vdb
 import vdns.common
 import vdns.db_tables
 
-from typing import Optional, Type
+from typing import Any, Optional, Type
 
 
 class DB(vdns.src.src0.Source):
     """Implements the db-based datasource."""
     db: vdns.db.DB
 
+    # The domains row as read by the last get_data(), for has_changed() to reuse instead of reading it again. This
+    # is only correct because ZoneMaker calls get_data(), has_changed() and set_serial() in that order, with nothing
+    # updating the row in between. has_changed() uses it at most once and set_serial() drops it, since it changes ts.
+    _domain_row: Optional[vdns.db_tables.Domain]
+
     def __init__(self, domain: str):
         vdns.src.src0.Source.__init__(self, domain)
         db = vdns.db.get_db()
         self.db = db
+        self._domain_row = None
 
-    def _get_domain_related_data(self, rr: Type[vdns.rr.T_RR_SOA], source: vdns.vdb.Table,
-                                 domain: str) -> list[vdns.rr.T_RR_SOA]:
-        dt = source.read_flat({'domain': domain})
-        return [rr.from_db_record(x) for x in dt]  # type: ignore
+    @staticmethod
+    def _make_rrs(rr: Type[vdns.rr.T_RR_SOA], rows: list[Any]) -> list[vdns.rr.T_RR_SOA]:
+        return [rr.from_db_record(x) for x in rows]  # type: ignore
 
     def _get_hosts(self) -> list[vdns.db.db_tables.Host]:
         """Returns the host entries taking care of dynamic entries
@@ -54,17 +58,27 @@ class DB(vdns.src.src0.Source):
 
         # Get zone data
         domain = self.db.domains.read_one({'name': dom})
-        network = self.db.networks.read_one({'domain': dom})
+        self._domain_row = domain
 
         if domain is None:
             logging.debug('No domain data for %s', dom)
             return None
 
+        # Read the network entry and all record tables in one go. None of them depend on each other.
+        db = self.db
+        networks, cnames, ns, mx, dnssec, txt, sshfp, dkim, srv = db.read_domain_tables(
+            dom, (db.networks, db.cnames, db.ns, db.mx, db.dnssec, db.txt, db.sshfp, db.dkim, db.srv))
+
+        if len(networks) > 1:
+            raise vdns.vdb.VDBError(f'Found more than one network entries for {dom}')
+        network: Optional[vdns.db_tables.Network] = networks[0] if networks else None
+
         if network:
             logging.debug('This is a network zone')
 
         serial = domain.serial or 1
-        ret = vdns.src.src0.DomainData(serial=serial)
+        # Pass the SOA directly so that a default one isn't built just to be replaced
+        ret = vdns.src.src0.DomainData(serial=serial, soa=vdns.rr.SOA.from_db_record(domain))
 
         if domain.reverse:
             if network is None:
@@ -77,15 +91,14 @@ class DB(vdns.src.src0.Source):
             hosts = self._get_hosts()
 
         ret.hosts = [vdns.rr.Host.from_db_record(x) for x in hosts]
-        ret.soa = vdns.rr.SOA.from_db_record(domain)
-        ret.cnames = self._get_domain_related_data(vdns.rr.CNAME, self.db.cnames, dom)
-        ret.ns = self._get_domain_related_data(vdns.rr.NS, self.db.ns, dom)
-        ret.mx = self._get_domain_related_data(vdns.rr.MX, self.db.mx, dom)
-        ret.dnssec = self._get_domain_related_data(vdns.rr.DNSSEC, self.db.dnssec, dom)
-        ret.txt = self._get_domain_related_data(vdns.rr.TXT, self.db.txt, dom)
-        ret.sshfp = self._get_domain_related_data(vdns.rr.SSHFP, self.db.sshfp, dom)
-        ret.dkim = self._get_domain_related_data(vdns.rr.DKIM, self.db.dkim, dom)
-        ret.srv = self._get_domain_related_data(vdns.rr.SRV, self.db.srv, dom)
+        ret.cnames = self._make_rrs(vdns.rr.CNAME, cnames)
+        ret.ns = self._make_rrs(vdns.rr.NS, ns)
+        ret.mx = self._make_rrs(vdns.rr.MX, mx)
+        ret.dnssec = self._make_rrs(vdns.rr.DNSSEC, dnssec)
+        ret.txt = self._make_rrs(vdns.rr.TXT, txt)
+        ret.sshfp = self._make_rrs(vdns.rr.SSHFP, sshfp)
+        ret.dkim = self._make_rrs(vdns.rr.DKIM, dkim)
+        ret.srv = self._make_rrs(vdns.rr.SRV, srv)
 
         # Also store subdomains
         subs = self.db.get_subdomains(dom)
@@ -94,29 +107,22 @@ class DB(vdns.src.src0.Source):
         return ret
 
     def has_changed(self) -> bool:
-        domain = self.domain
-
-        dt = self.db.domains.read_one({'name': domain})
-        assert dt is not None
-
-        # old=dt['serial']
-
-        if dt.ts is None:
-            ts = 0
-        else:
-            ts = int(time.mktime(dt.ts.timetuple()))
-
+        dt = self._domain_row
+        self._domain_row = None
+        if dt is None:
+            # Let the db do the comparison instead of reading the whole row
+            changed = self.db.domain_changed(self.domain)
+            assert changed is not None
+            return changed
+
+        # store_serial() sets ts to updated, so only ordering matters. Compare the timestamps directly, in whole
+        # seconds like domain_changed() does.
         if dt.updated is None:
-            updated = 0
-        else:
-            updated = int(time.mktime(dt.updated.timetuple()))
-
-        if updated <= ts:
-            ret = False
-        else:
-            ret = True
+            return False
+        if dt.ts is None:
+            return True
 
-        return ret
+        return dt.updated.replace(microsecond=0) > dt.ts.replace(microsecond=0)
 
     def incserial(self, oldserial: int) -> int:
         """! Increment the serial number if needed.
@@ -134,6 +140,8 @@ class DB(vdns.src.src0.Source):
         logging.debug('Storing serial number for %s: %s', domain, serial)
 
         self.db.store_serial(domain, serial)
+        # This changes ts
+        self._domain_row = None
 
 # End of class DB
 
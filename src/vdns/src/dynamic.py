@@ -14,8 +14,12 @@
 # limitations under the License.
 
 import os
+import sys
 import errno
 import logging
+import itertools
+import collections
+import dataclasses as dc
 
 import vdns.db
 import vdns.rr
@@ -24,7 +28,23 @@ import vdns.src.src0
 import vdns.db_tables
 import vdns.zoneparser
 
-from typing import Optional
+from typing import Iterator, Optional
+
+
+@dc.dataclass(slots=True)
+class _ZoneFile:
+    """A parsed zone file."""
+    # The (mtime, size) of the file when it was parsed
+    stamp: tuple[int, int]
+    data: vdns.src.src0.DomainData
+    # data.hosts indexed by hostname. Built on first use.
+    by_host: Optional[dict[str, list[vdns.rr.Host]]] = None
+
+
+# Parsed zone files as (path, domain) -> _ZoneFile, shared by all Dynamic instances so that a file is only
+# parsed once per change. Kept in LRU order.
+_zoneinfo_cache: collections.OrderedDict[tuple[str, str], _ZoneFile] = collections.OrderedDict()
+_ZONEINFO_CACHE_SIZE = 256
 
 
 class NoSuchZoneFileError(OSError):
@@ -40,6 +60,8 @@ class Dynamic(vdns.src.src0.Source):
     db: vdns.db.DB
     zonedir: str
     zonefile: str
+    # The dynamic entries as read by get_dynamic(). An instance is per domain so they are read once.
+    _dynamic: Optional[list[vdns.db_tables.Dynamic]]
 
     def __init__(self, domain: str, zonedir: str, zonefile: str) -> None:
         """!
@@ -53,46 +75,110 @@ class Dynamic(vdns.src.src0.Source):
         self.db = vdns.db.get_db()
         self.zonedir = zonedir
         self.zonefile = zonefile
+        self._dynamic = None
 
     def get_dynamic(self) -> list[vdns.db_tables.Dynamic]:
         """
         Return the dynamic entries of a domain
+
+        Only the first call queries the db. That includes domains without
+        dynamic entries.
         """
-        # res = self.db.get_domain_related_data('dynamic', self.domain)
-        res = self.db.dynamic.read_flat({'domain': self.domain})
+        if self._dynamic is None:
+            # res = self.db.get_domain_related_data('dynamic', self.domain)
+            self._dynamic = self.db.dynamic.read_flat({'domain': self.domain})
 
-        return res
+        return self._dynamic
 
-    def read_zone_file(self) -> vdns.src.src0.DomainData:
+    @staticmethod
+    def _zone_file_stamp(fn: str) -> tuple[int, int]:
+        """
+        Return the (mtime, size) of a zone file, to tell whether it changed since it was parsed
+
+        @raise NoSuchZoneFileError if the file doesn't exist
+        """
+        try:
+            st = os.stat(fn)
+        except FileNotFoundError:
+            raise NoSuchZoneFileError(fn) from None
+
+        return st.st_mtime_ns, st.st_size
+
+    def _read_zone_file(self) -> _ZoneFile:
         """
-        Read the contents of a zone file and return them in a processed
-        form as returned by ZoneInfo.data()
+        Return the parsed zone file, parsing it only if it changed since last time
 
-        @return The data or None if the file failed to open / doesn't exist
+        @raise NoSuchZoneFileError if the file doesn't exist or can't be read
         """
         fn = self.zonedir + '/' + self.zonefile
 
-        if not os.path.exists(fn):
+        stamp = self._zone_file_stamp(fn)
+        key = (os.path.abspath(fn), self.domain)
+        cached = _zoneinfo_cache.get(key)
+        if cached is not None and cached.stamp == stamp:
+            _zoneinfo_cache.move_to_end(key)
+            return cached
+
+        # Only the hosts and the SOA are used. The file may have gone away since the stat, so rely on the open
+        # instead of checking beforehand.
+        z = vdns.zoneparser.ZoneParser(rrtypes=('A', 'AAAA'))
+        if not z.read(fn, self.domain):
             raise NoSuchZoneFileError(fn)
+        ret = _ZoneFile(stamp=stamp, data=z.data())
 
-        z = vdns.zoneparser.ZoneParser(fn, self.domain)
-        ret = z.data()
+        _zoneinfo_cache[key] = ret
+        _zoneinfo_cache.move_to_end(key)
+        if len(_zoneinfo_cache) > _ZONEINFO_CACHE_SIZE:
+            _zoneinfo_cache.popitem(last=False)
 
         return ret
 
-    def read_dynamic(self) -> dict[str, dict[str, list[vdns.rr.Host]]]:
+    def read_zone_file(self) -> vdns.src.src0.DomainData:
+        """
+        Read the hosts and the SOA of a zone file and return them in a
+        processed form as returned by ZoneInfo.data()
+
+        The parsed data are reused for as long as the file doesn't change,
+        since get_data() needs them more than once and other instances may
+        read the same file. They must not be modified.
+
+        @return The data
+        @raise NoSuchZoneFileError if the file doesn't exist or can't be read
+        """
+        return self._read_zone_file().data
+
+    def read_zone_hosts(self) -> dict[str, list[vdns.rr.Host]]:
+        """
+        Return the hosts of the zone file indexed by hostname
+
+        Like read_zone_file(), the index is reused for as long as the file
+        doesn't change and must not be modified.
+
+        @raise NoSuchZoneFileError if the file doesn't exist or can't be read
+        """
+        zf = self._read_zone_file()
+        if zf.by_host is None:
+            by_host: dict[str, list[vdns.rr.Host]] = {}
+            for host in zf.data.hosts:
+                by_host.setdefault(host.hostname or '', []).append(host)
+            zf.by_host = by_host
+        return zf.by_host
+
+    def read_dynamic(self, dyns: Optional[list[vdns.db_tables.Dynamic]] = None) -> dict[str, list[vdns.rr.Host]]:
         """
         Read dynamic IP addresses from existing files
 
         Returns a dictionary where key is the hostname. Each entry is
-        a dictionary as follows
-        {'a': [list of A records], 'aaaa': [list of AAAA records]}
+        the list of A records of that host followed by its AAAA records,
+        each in file order.
 
-        Record format is the same as the hosts table
+        @param dyns     The dynamic entries of the domain, if already read.
+                        They are read from the db otherwise.
         """
 
         # Get database entries
-        dyns = self.get_dynamic()
+        if dyns is None:
+            dyns = self.get_dynamic()
 
         # If this domain doesn't have anything dynamic then be cool
         if len(dyns) == 0:
@@ -101,64 +187,61 @@ class Dynamic(vdns.src.src0.Source):
         logging.debug('Domain %s has %d dynamic entries', self.domain, len(dyns))
 
         # Ensure a record for each dynamic entry
-        ret: dict[str, dict[str, list[vdns.rr.Host]]] = {}
+        ret: dict[str, list[vdns.rr.Host]] = {}
         for dyn in dyns:
-            hn = dyn.hostname
-            if hn is None:
-                hn = ''
-            ret[hn] = {'a': [], 'aaaa': []}
+            # Interned like the zone file hostnames, so that lookups in the zone file index compare by identity
+            hn = sys.intern(dyn.hostname or '')
+            ret[hn] = []
 
-        zoneinfo = self.read_zone_file()
-        # If we cannot open the old file then we risk losing information
-        if zoneinfo is None:
-            vdns.common.abort(f'Could not open file for dynamic hosts for {self.domain}')
+        # Only the dynamic hostnames get looked up. Zones normally have a lot more hosts than dynamic entries.
+        by_host = self.read_zone_hosts()
 
         # Add information from the file
-        for host in zoneinfo.hosts:
-            if host.hostname is None:
-                hn = ''
-            else:
-                hn = host.hostname
-
-            # Only handle file entries that exist in the dynamic table
-            if hn not in ret:
+        for hn, entry in ret.items():
+            hosts = by_host.get(hn)
+            if not hosts:
                 continue
+            assert all(host.domain == self.domain for host in hosts)
+            # A before AAAA, as the generated zone files have always had them. sorted() is stable.
+            entry.extend(sorted(hosts, key=lambda x: x.ip.version))
 
-            # TODO: Get rid of a/aaaa and just return a list of all host entries
-            if host.ip.version == 4:
-                rrtype = 'a'
-            else:
-                rrtype = 'aaaa'
+        return ret
 
-            assert host.domain == self.domain
-            assert host.hostname == hn
-            ret[hn][rrtype].append(host)
+    def _iter_hosts(self, dyns: Optional[list[vdns.db_tables.Dynamic]] = None) -> Iterator[vdns.rr.Host]:
+        """
+        Yield the host entries of get_hosts() without collecting them first
 
-        return ret
+        @param dyns     As in read_dynamic()
+        """
+        # Get dynamic entries
+        dynamic = self.read_dynamic(dyns)
+
+        # Bind the (root) logger once instead of going through logging.debug() for every entry
+        logger = logging.getLogger()
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        # Add the dynamic entries
+        for entry in itertools.chain.from_iterable(dynamic.values()):
+            if debug:
+                logger.debug('Adding dynamic entry %s %s', entry.hostname, entry.ip)
+            yield entry
 
-    def get_hosts(self) -> Optional[list[vdns.rr.Host]]:
+    def get_hosts(self, dyns: Optional[list[vdns.db_tables.Dynamic]] = None) -> Optional[list[vdns.rr.Host]]:
         """
         Return the host entries taking care of dynamic entries
 
         Dynamic entries that exist in the hosts table will not be included.
         Dynamic entries will get their values from the zone file
+
+        @param dyns     As in read_dynamic()
+        @return The entries, or None if there are none
         """
-        # Get dynamic entries
-        dynamic = self.read_dynamic()
+        hosts = list(self._iter_hosts(dyns))
 
         # Simplest case
-        if len(dynamic) == 0:
+        if not hosts:
             return None
 
-        hosts = []
-
-        # Add the dynamic entries
-        for host, entries in dynamic.items():
-            for i in ('a', 'aaaa'):
-                for entry in entries[i]:
-                    logging.debug('Adding dynamic entry %s %s %s', host, i, entry.ip.compressed)
-                    hosts.append(entry)
-
         return hosts
 
     def determine_dynamic_serial(self, serial: int) -> int:
@@ -186,14 +269,11 @@ class Dynamic(vdns.src.src0.Source):
     def get_data(self) -> Optional[vdns.src.src0.DomainData]:
         dom = self.domain
 
-        if not self.db.is_dynamic(dom):
-            return None
-
-        domain = self.db.domains.read_one({'name': dom})
-        network = self.db.networks.read_one({'domain': dom})
-
-        if not domain:
+        ctx = self.db.get_dynamic_context(dom)
+        if ctx is None:
             return None
+        domain = ctx.domain
+        network = ctx.network
 
         ret = vdns.src.src0.DomainData(dom)
 
@@ -203,7 +283,8 @@ class Dynamic(vdns.src.src0.Source):
         else:
             ret.name = dom
 
-        hosts = self.get_hosts()
+        # Collect the entries straight into the result
+        hosts = list(self._iter_hosts(ctx.dynamic))
         # TODO: Convert timestamps (?)
 
         if not hosts:
@@ -15,6 +15,7 @@
 
 import textwrap
 import unittest
+import unittest.mock
 
 import vdns.db
 import vdns.db_testlib
@@ -63,15 +64,88 @@ class DynamicTest(unittest.TestCase):
         self.assertIsNotNone(hosts)
         assert hosts is not None  # For mypy
 
+        ips = {x.ip.compressed for x in hosts}
+        hostnames = {x.hostname for x in hosts}
+
         # Only the dynamic entry should be returned
-        self.assertIn('10.1.1.1', [x.ip.compressed for x in hosts])
-        self.assertNotIn('10.1.1.2', [x.ip.compressed for x in hosts])
+        self.assertIn('10.1.1.1', ips)
+        self.assertNotIn('10.1.1.2', ips)
 
         # Only the dynamic host with an entry should exist
-        self.assertIn('host1', [x.hostname for x in hosts])
-        self.assertNotIn('host2', [x.hostname for x in hosts])
-        self.assertNotIn('host3', [x.hostname for x in hosts])
+        self.assertIn('host1', hostnames)
+        self.assertNotIn('host2', hostnames)
+        self.assertNotIn('host3', hostnames)
 
         # If the dynamic file's serial is higher than the known one the turn the dynamic file's
         self.assertEqual(d.determine_dynamic_serial(1), 20220522)
         self.assertEqual(d.determine_dynamic_serial(30000000), 30000000)
+
+    def test_get_dynamic_cached(self) -> None:
+        d = self._get_dynamic('nodynamic.com', _SOA)
+        with unittest.mock.patch.object(d.db.dynamic, 'read_flat', wraps=d.db.dynamic.read_flat) as read_flat:
+            self.assertIsNone(d.get_hosts())
+            self.assertEqual(d.get_dynamic(), [])
+        read_flat.assert_called_once()
+
+    def test_read_zone_file_cached(self) -> None:
+        d = self._get_dynamic('dom.com', _SOA)
+        zoneinfo = d.read_zone_file()
+        self.assertIs(d.read_zone_file(), zoneinfo)
+
+        # Re-read when the file changes
+        with unittest.mock.patch.object(d, '_zone_file_stamp', return_value=(1, 0)):
+            self.assertIsNot(d.read_zone_file(), zoneinfo)
+
+    def test_read_zone_hosts(self) -> None:
+        contents = textwrap.dedent(f'''
+        {_SOA}
+        host1 IN A 10.1.1.1
+              IN AAAA 2001:db8:1::1
+        host2 IN A 10.1.1.2
+        ''')
+        d = self._get_dynamic('dom.com', contents)
+        by_host = d.read_zone_hosts()
+        self.assertEqual({k: [x.ip.compressed for x in v] for k, v in by_host.items()},
+                         {'host1': ['10.1.1.1', '2001:db8:1::1'], 'host2': ['10.1.1.2']})
+        self.assertIs(d.read_zone_hosts(), by_host)
+
+    def test_read_dynamic_order(self) -> None:
+        contents = textwrap.dedent(f'''
+        {_SOA}
+        host1 IN AAAA 2001:db8:1::1
+              IN A 10.1.1.1
+              IN AAAA 2001:db8:1::2
+              IN A 10.1.1.2
+        ''')
+        d = self._get_dynamic('dom.com', contents)
+        # All A records of a host come before its AAAA records
+        self.assertEqual({k: [x.ip.compressed for x in v] for k, v in d.read_dynamic().items()},
+                         {'host1': ['10.1.1.1', '10.1.1.2', '2001:db8:1::1', '2001:db8:1::2'], 'host3': []})
+
+    def test_read_zone_file_shared(self) -> None:
+        d1 = self._get_dynamic('dom.com', _SOA)
+        d2 = dynamic.Dynamic('dom.com', './', 'somefile')
+        self.assertIs(d1.read_zone_file(), d2.read_zone_file())
+
+    def test_get_data_parses_once(self) -> None:
+        vdns.db_testlib.add_test_data()
+        contents = textwrap.dedent('''
+        $ORIGIN dyn.v13.gr.
+        @ 1D IN SOA ns1.example.com. dns.dyn.v13.gr. ( 2022060430 1D 1H 30D 1M )
+        host1 IN A 10.9.1.1
+        ''')
+        d = self._get_dynamic('dyn.v13.gr', contents)
+        with unittest.mock.patch.object(dynamic.vdns.zoneparser, 'ZoneParser',
+                                        wraps=dynamic.vdns.zoneparser.ZoneParser) as zp:
+            dt = d.get_data()
+        zp.assert_called_once()
+
+        assert dt is not None
+        self.assertEqual(dt.serial, 2022060430)
+        self.assertEqual([x.ip.compressed for x in dt.hosts], ['10.9.1.1'])
+
+    def test_zone_file_gone(self) -> None:
+        d = self._get_dynamic('dom.com', _SOA)
+        with unittest.mock.patch.object(dynamic.vdns.zoneparser.ZoneParser, '_read_file', return_value=None):
+            with self.assertRaises(dynamic.NoSuchZoneFileError):
+                d.read_zone_file()
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
 import vdns.db
 import vdns.src.dynamic
 import vdns.zoneparser
@@ -20,12 +22,12 @@ import vdns.zoneparser
 from typing import Any, Optional
 from unittest import mock
 
-_contents: str = ''
+_contents: list[str] = []
 _dynamic_entries: vdns.db.DBReadResults = []
 
 
 def _mock_read_file(fn: str) -> Optional[list[str]]:  # pylint: disable=unused-argument
-    return _contents.splitlines()
+    return _contents
 
 
 def _mock_get_dynamic() -> vdns.db.DBReadResults:
@@ -34,7 +36,10 @@ def _mock_get_dynamic() -> vdns.db.DBReadResults:
 
 def set_contents(st: str) -> None:
     global _contents
-    _contents = st
+    # Split once here instead of on every mocked read
+    _contents = st.splitlines()
+    # The file stamp is mocked, so it won't invalidate the cached data
+    vdns.src.dynamic._zoneinfo_cache.clear()
 
 
 def set_dynamic_entries(entries: vdns.db.DBReadResults) -> None:
@@ -43,10 +48,17 @@ def set_dynamic_entries(entries: vdns.db.DBReadResults) -> None:
 
 
 def init() -> dict[str, Any]:
-    patchers = {}
+    """Patches the zone file access of Dynamic. The caller must stop the returned patchers."""
+    patchers: dict[str, Any] = {}
+    p: Any
+
+    # A cache of its own, so that parsed mock contents don't leak to other tests
+    p = mock.patch.object(vdns.src.dynamic, '_zoneinfo_cache', collections.OrderedDict())
+    patchers['dynamic._zoneinfo_cache'] = p
+    p.start()
 
-    p = mock.patch('os.path.exists', return_value=True)
-    patchers['os.path.exists'] = p
+    p = mock.patch.object(vdns.src.dynamic.Dynamic, '_zone_file_stamp', return_value=(0, 0))
+    patchers['dynamic.Dynamic._zone_file_stamp'] = p
     p.start()
 
     p = mock.patch.object(vdns.zoneparser.ZoneParser, '_read_file', side_effect=_mock_read_file)
@@ -17,6 +17,7 @@
 # limitations under the License.
 
 import time
+import logging
 import datetime
 import dataclasses as dc
 
@@ -27,8 +28,25 @@ from typing import Optional, Sequence
 
 RRTypeList = Sequence[Sequence[vdns.rr.RR]]
 
+# The minute of the last _today() call, along with the date it returned
+_today_cache: Optional[tuple[int, int]] = None
 
-@dc.dataclass
+
+def _today() -> int:
+    """Returns today's date as YYYYMMDD.
+
+    Cached for the current minute since it's needed for every zone of a run. Day changes happen on minute boundaries.
+    """
+    global _today_cache
+
+    minute = int(time.time()) // 60
+    if _today_cache is None or _today_cache[0] != minute:
+        ts = datetime.date.today()
+        _today_cache = (minute, ts.year * 10000 + ts.month * 100 + ts.day)
+    return _today_cache[1]
+
+
+@dc.dataclass(slots=True)
 class DomainData:
     name: str = ''
     serial: int = 1
@@ -67,12 +85,12 @@ class DomainData:
     @property
     def host_reclist(self) -> RRTypeList:
         """Non-A/AAAA reclist for hosts. These are the RRs that accompany a host (A/AAAA)."""
-        return [self.mx, self.cnames, self.txt, self.dkim, self.srv, self.sshfp]
+        return (self.mx, self.cnames, self.txt, self.dkim, self.srv, self.sshfp)
 
     @property
     def toplevel_reclist(self) -> RRTypeList:
         """Non-A/AAAA reclist for domains. These are the RRs that are added at the top level."""
-        return [self.ns, self.mx, self.dnssec, self.txt, self.dkim, self.sshfp, self.srv]
+        return (self.ns, self.mx, self.dnssec, self.txt, self.dkim, self.sshfp, self.srv)
 
 
 class Source:
@@ -92,19 +110,19 @@ class Source:
 
         # If our convention is not the date then just increment by one
         if old > 1000000000:
-            ts = datetime.date.fromtimestamp(time.time())
-            # ser0 = '%04d%02d%02d' % (ts.year, ts.month, ts.day)
-            ser0 = f'{ts.year:04}{ts.month:02}{ts.day:02}'
+            # The date as YYYYMMDD, and the first serial of the day as YYYYMMDD00
+            today = _today()
+            first = today * 100
 
-            if str(old)[:len(ser0)] == ser0:
+            if old // 100 == today:
                 # Same day
-                idx = old % 100
-                # ser = int(ser0 + '%02d' % (idx + 1,))
-                ser = int(f'{ser0}{(idx+1):02}')
-            elif old < (int(ser0) * 100):
+                ser = old + 1
+                if old % 100 == 99:
+                    logging.warning('Ran out of serials for %s today. Using %d, which is tomorrow\'s first serial',
+                                    self.domain, ser)
+            elif old < first:
                 # Normal increament
-                # ser = int(ser0 + '00')
-                ser = int(f'{ser0}00')
+                ser = first
             else:
                 # Fail!
                 raise Exception(f'Old serial ({old}) for {self.domain} is in the future')
@@ -0,0 +1,70 @@
+# Copyright (c) 2014-2016 Stefanos Harhalakis <v13@v13.gr>
+# Copyright (c) 2016-2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import types
+import datetime
+import unittest
+import unittest.mock
+import parameterized
+
+from vdns.src import src0
+
+
+class FakeDate(datetime.date):
+    @classmethod
+    def today(cls) -> 'FakeDate':
+        return cls(2022, 6, 4)
+
+
+class SourceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Only src0's reference to the datetime module, to not affect anything else
+        p = unittest.mock.patch.object(src0, 'datetime', types.SimpleNamespace(date=FakeDate))
+        p.start()
+        self.addCleanup(p.stop)
+        src0._today_cache = None
+
+    def tearDown(self) -> None:
+        src0._today_cache = None
+
+    @parameterized.parameterized.expand([
+        # Not date-based
+        (10, 11),
+        (1000000000, 1000000001),
+        # Same day
+        (2022060400, 2022060401),
+        (2022060417, 2022060418),
+        # Earlier day
+        (2022060399, 2022060400),
+        (2021123105, 2022060400),
+    ])
+    def test_incserial_date(self, old: int, new: int) -> None:
+        self.assertEqual(src0.Source('dom.com').incserial_date(old), new)
+
+    def test_incserial_date_last_of_day(self) -> None:
+        # There is no room for another serial today. Use the first one of tomorrow.
+        with self.assertLogs(level='WARNING'):
+            self.assertEqual(src0.Source('dom.com').incserial_date(2022060499), 2022060500)
+
+    def test_incserial_date_future(self) -> None:
+        with self.assertRaises(Exception):
+            src0.Source('dom.com').incserial_date(2022060500)
+
+    def test_today_cached(self) -> None:
+        self.assertEqual(src0._today(), 20220604)
+        with unittest.mock.patch.object(FakeDate, 'today') as today:
+            self.assertEqual(src0._today(), 20220604)
+            today.assert_not_called()
@@ -16,45 +16,111 @@
 import os
 import pwd
 import grp
+import stat
 import logging
+import tempfile
+import functools
 
 from typing import Optional
 
 
+@functools.lru_cache(maxsize=32)
+def _resolve_uid(owner: str) -> int:
+    """Returns the uid of a user. Cached since the lookup may go over the network (NSS) and files are normally
+    written with the same owner."""
+    return pwd.getpwnam(owner).pw_uid
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_gid(group: str) -> int:
+    """Returns the gid of a group. Cached like _resolve_uid()."""
+    return grp.getgrnam(group).gr_gid
+
+
+def _umask() -> int:
+    """Returns the current umask. It can only be read by setting it."""
+    ret = os.umask(0o022)
+    os.umask(ret)
+    return ret
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    """Writes all the data to fd. os.write() may write less than asked for."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 def write_file(fn: str, contents: str, perms: Optional[int] = None, owner: Optional[str] = None,
                group: Optional[str] = None) -> None:
-    if perms:
-        perms2 = perms
-    else:
-        perms2 = 0o666
+    """Writes a file atomically.
+
+    The contents go to a temporary file next to the target which then replaces it, so readers (e.g. bind
+    reloading) never see a partially written file. Symlinks are followed. An existing file keeps its permissions,
+    owner and group unless they are given. Files with more than one hard link are rewritten in place instead, since
+    replacing them would split the links.
+
+    The directory of the file must be writable, even if the file itself is: the temporary file is created there.
+    Writing fails with PermissionError otherwise, leaving the file as it was. Each file is also fsync()ed before it
+    replaces the old one.
+    """
+    # Replace the file that fn points to, not the link
+    real_fn = os.path.realpath(fn)
+
+    st: Optional[os.stat_result]
+    try:
+        st = os.stat(real_fn)
+    except FileNotFoundError:
+        st = None
+
+    # Zone data are ASCII. Encode them in one go and write the bytes straight to the fd, without a file object in
+    # between.
+    data = contents.encode('utf-8')
+
+    if st is not None and st.st_nlink > 1:
+        fd = os.open(real_fn, os.O_WRONLY | os.O_TRUNC | os.O_CLOEXEC)
+        try:
+            # Bypass umask
+            if perms:
+                os.fchmod(fd, perms)
+            if owner or group:
+                os.fchown(fd, _resolve_uid(owner) if owner else -1, _resolve_gid(group) if group else -1)
+            _write_fd(fd, data)
+        finally:
+            os.close(fd)
+        logging.debug('Wrote %d bytes to %s', len(data), fn)
+        return
 
-    fd = os.open(fn, os.O_CREAT | os.O_RDWR | os.O_TRUNC, perms2)
+    if not perms:
+        # What creating the file in place would give. mkstemp() creates it as 0600.
+        perms = stat.S_IMODE(st.st_mode) if st is not None else 0o666 & ~_umask()
+    uid = _resolve_uid(owner) if owner else (st.st_uid if st is not None else -1)
+    gid = _resolve_gid(group) if group else (st.st_gid if st is not None else -1)
 
-    # Bypass umask
-    if perms:
-        os.fchmod(fd, perms)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(real_fn), prefix=f'.{os.path.basename(real_fn)}.')
 
-    if owner or group:
-        if owner:
-            pw = pwd.getpwnam(owner)
-            uid = pw.pw_uid
-        else:
-            uid = -1
+    try:
+        try:
+            os.fchmod(fd, perms)
 
-        if group:
-            gr = grp.getgrnam(group)
-            gid = gr.gr_gid
-        else:
-            gid = -1
+            # Only when needed, since only root can give files away
+            tmp_st = os.fstat(fd)
+            if (uid != -1 and uid != tmp_st.st_uid) or (gid != -1 and gid != tmp_st.st_gid):
+                os.fchown(fd, uid, gid)
 
-        os.fchown(fd, uid, gid)
+            _write_fd(fd, data)
 
-    f = os.fdopen(fd, 'w')
-    f.write(contents)
+            # Once per file, so that the rename never exposes a file whose data aren't on disk
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
-    f.close()
+        os.replace(tmp, real_fn)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
-    logging.debug('Wrote %d bytes to %s', len(contents), fn)
+    logging.debug('Wrote %d bytes to %s', len(data), fn)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+# Copyright (c) 2014-2016 Stefanos Harhalakis <v13@v13.gr>
+# Copyright (c) 2016-2022 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pwd
+import stat
+import tempfile
+import unittest
+import unittest.mock
+
+import vdns.util.common
+
+
+class CommonTest(unittest.TestCase):
+
+    def test_write_file(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'file')
+            vdns.util.common.write_file(fn, 'longer contents\n')
+            vdns.util.common.write_file(fn, 'contents\n', 0o600)
+
+            with open(fn, encoding='ASCII') as f:
+                self.assertEqual(f.read(), 'contents\n')
+            self.assertEqual(stat.S_IMODE(os.stat(fn).st_mode), 0o600)
+
+    def test_write_file_atomic(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'file')
+            vdns.util.common.write_file(fn, 'old\n', 0o640)
+            ino = os.stat(fn).st_ino
+
+            vdns.util.common.write_file(fn, 'new\n')
+            st = os.stat(fn)
+            self.assertNotEqual(st.st_ino, ino)
+            # The permissions of the replaced file are kept
+            self.assertEqual(stat.S_IMODE(st.st_mode), 0o640)
+            self.assertEqual(os.listdir(d), ['file'])
+
+            # No temporary file is left behind on failure
+            with unittest.mock.patch('os.write', side_effect=OSError):
+                with self.assertRaises(OSError):
+                    vdns.util.common.write_file(fn, 'failed\n')
+            self.assertEqual(os.listdir(d), ['file'])
+            with open(fn, encoding='ASCII') as f:
+                self.assertEqual(f.read(), 'new\n')
+
+    def test_write_file_symlink(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'file')
+            link = os.path.join(d, 'link')
+            vdns.util.common.write_file(fn, 'old\n')
+            os.symlink('file', link)
+
+            vdns.util.common.write_file(link, 'new\n')
+            self.assertTrue(os.path.islink(link))
+            with open(fn, encoding='ASCII') as f:
+                self.assertEqual(f.read(), 'new\n')
+
+    def test_write_file_hardlink(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'file')
+            fn2 = os.path.join(d, 'file2')
+            vdns.util.common.write_file(fn, 'old\n')
+            os.link(fn, fn2)
+
+            vdns.util.common.write_file(fn, 'new\n')
+            self.assertTrue(os.path.samefile(fn, fn2))
+            with open(fn2, encoding='ASCII') as f:
+                self.assertEqual(f.read(), 'new\n')
+
+    def test_write_file_readonly_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'file')
+            vdns.util.common.write_file(fn, 'old\n')
+
+            # A writable file in a read-only directory can't be replaced. Mocked, since root can write anyway.
+            with unittest.mock.patch('tempfile.mkstemp', side_effect=PermissionError):
+                with self.assertRaises(PermissionError):
+                    vdns.util.common.write_file(fn, 'new\n')
+            with open(fn, encoding='ASCII') as f:
+                self.assertEqual(f.read(), 'old\n')
+
+    def test_write_file_owner(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'file')
+            vdns.util.common.write_file(fn, 'old\n')
+            st = os.stat(fn)
+
+            # The replacement gets the owner and group of the replaced file
+            fake = os.stat_result((st.st_mode, st.st_ino, st.st_dev, st.st_nlink, 1234, 5678) + tuple(st)[6:])
+            with unittest.mock.patch('os.stat', return_value=fake), \
+                    unittest.mock.patch('os.fchown') as fchown:
+                vdns.util.common.write_file(fn, 'new\n')
+            fchown.assert_called_once_with(unittest.mock.ANY, 1234, 5678)
+
+    def test_resolve_uid_cached(self) -> None:
+        vdns.util.common._resolve_uid.cache_clear()
+        with unittest.mock.patch('pwd.getpwnam', wraps=pwd.getpwnam) as getpwnam:
+            uid = vdns.util.common._resolve_uid('root')
+            self.assertEqual(vdns.util.common._resolve_uid('root'), uid)
+        self.assertEqual(uid, 0)
+        getpwnam.assert_called_once_with('root')
@@ -52,6 +52,9 @@ class MergedConfig:
     def __locate_object(self, name: str) -> Optional[object]:
         """Locates the object that holds the attribute name
 
+        Not cached: the configs are mutable, so a config with a higher
+        priority may gain the attribute later.
+
         @param name     The attribute to lookup
         @return The object or None
         """
@@ -61,10 +64,14 @@ class MergedConfig:
         return None
 
     def __getattr__(self, name: str) -> Any:
+        # Special attributes are never config. Python probes a lot of them (copy, pickle, etc).
+        if name.startswith('__'):
+            raise AttributeError(name)
+
         obj = self.__locate_object(name)
 
         if not obj:
-            raise AttributeError()
+            raise AttributeError(name)
 
         ret = getattr(obj, name)
 
@@ -78,12 +85,12 @@ class MergedConfig:
         obj = self.__locate_object(name)
 
         if not obj:
-            raise AttributeError()
+            raise AttributeError(name)
 
         setattr(obj, name, value)
 
     def __str__(self) -> str:
-        args = ', '.join([str(x) for x in self.cfgs])
+        args = ', '.join(map(str, self.cfgs))
         ret = f'MergedConfig({args})'
 
         return ret
@@ -56,3 +56,32 @@ class MergeConfigTest(unittest.TestCase):
         mo.t4 = 9
         self.assertEqual(mo.t4, 9)
         self.assertEqual(o2.t4, 9)
+
+    def test_priority_change(self) -> None:
+        class Obj1:
+            t1 = 1
+
+        class Obj2:
+            t2 = 2
+
+        o1 = Obj1()
+        mo = vdns.util.config.MergedConfig(o1, Obj2())
+        self.assertEqual(mo.t2, 2)
+
+        # A config with a higher priority takes over once it has the attribute
+        o1.t2 = 3  # type: ignore
+        self.assertEqual(mo.t2, 3)
+
+        with self.assertRaisesRegex(AttributeError, 't3'):
+            _ = mo.t3
+
+    def test_special_attributes(self) -> None:
+        class Obj1:
+            t1 = 1
+            __special__ = 1
+
+        mo = vdns.util.config.MergedConfig(Obj1())
+        # Not looked up in the configs
+        with self.assertRaises(AttributeError):
+            _ = mo.__special__
+        self.assertEqual(mo.t1, 1)
@@ -15,6 +15,7 @@
 
 import copy
 import enum
+import operator
 import dataclasses as dc
 
 import vdns.rr
@@ -23,6 +24,9 @@ import vdns.common
 
 from typing import Any, Optional, Sequence
 
+# Host and PTR sort keys are never None, so these can be sorted by key instead of pairwise via RR.__lt__()
+_by_sort_key = operator.attrgetter('sort_key')
+
 
 @dc.dataclass
 class ZoneData:
@@ -79,7 +83,7 @@ class Zone0:
         Create the top-level entries.
         These are the entries with empty hostname or hostname=='.'
         """
-        ret = ''
+        ret: list[str] = []
         data = self.dt.data
 
         # Top-level entries without a host part first
@@ -90,14 +94,14 @@ class Zone0:
                 # Transform DNSSEC to DNSKEY
                 if isinstance(rec, vdns.rr.DNSSEC):
                     rec = vdns.rr.DNSKEY.from_dnssec(rec)
-                ret += rec.record()
+                ret.append(rec.record())
 
         # Host entries
         if not self.dt.reverse:
             for rec in data.hosts:
                 if rec.associated_hostname:
                     continue
-                ret += rec.record()
+                ret.append(rec.record())
 
         # Top-level entries with a host part next, like DKIM and SRV
         for recs in data.toplevel_reclist:
@@ -106,9 +110,9 @@ class Zone0:
                     continue
                 if isinstance(rec, vdns.rr.DNSSEC):
                     rec = vdns.rr.DNSKEY.from_dnssec(rec)
-                ret += rec.record()
+                ret.append(rec.record())
 
-        return ret
+        return ''.join(ret)
 
     def make_subzones(self) -> str:
         """
@@ -116,8 +120,8 @@ class Zone0:
         For now these are entries that have NS
         """
 
-        ret = ''
-        glue = ''
+        ret: list[str] = []
+        glue: list[str] = []
 
         nl_added: bool
 
@@ -128,21 +132,21 @@ class Zone0:
             for recs in subsoa_rrs:
                 for rec in recs:
                     if not nl_added:
-                        ret += '\n'
+                        ret.append('\n')
                         nl_added = True
-                    ret += rec.record()
+                    ret.append(rec.record())
 
             for rec in subdata.glue:
                 if not nl_added:
-                    ret += '\n'
+                    ret.append('\n')
                     nl_added = True
-                glue += rec.record()
+                glue.append(rec.record())
 
-        if glue != '':
-            ret += '\n; Glue records\n'
-            ret += glue
+        if glue:
+            ret.append('\n; Glue records\n')
+            ret.extend(glue)
 
-        return ret
+        return ''.join(ret)
 
     def make_hosts(self) -> str:
         """
@@ -152,7 +156,7 @@ class Zone0:
         TXTs, etc...
         """
         done = []  # List of entries already handled
-        ret = ''
+        ret: list[str] = []
 
         rec: vdns.rr.RR
         recs: Sequence[vdns.rr.RR]
@@ -163,8 +167,11 @@ class Zone0:
             if rec.hostname not in done:
                 done.append(rec.hostname)
 
+        # The same for every host below
+        host_reclist = self.dt.data.host_reclist
+
         # Examine all hosts
-        for rec in sorted(self.dt.data.hosts):
+        for rec in sorted(self.dt.data.hosts, key=_by_sort_key):
             hostname = rec.hostname
             if hostname == '':
                 continue
@@ -190,15 +197,15 @@ class Zone0:
                         continue
 
                     if is_first:
-                        ret += host.record()
+                        ret.append(host.record())
                         is_first = False
                     else:
                         host2 = copy.deepcopy(host)
                         host2.hostname = ''
-                        ret += host2.record()
+                        ret.append(host2.record())
 
             # Add additional info here - entries that will have their host part omitted
-            for recs2 in self.dt.data.host_reclist:
+            for recs2 in host_reclist:
                 for rec2 in recs2:
                     # Look for relevant entries
                     if rec2.associated_hostname != hostname:
@@ -210,12 +217,12 @@ class Zone0:
                         continue
 
                     if is_first:
-                        ret += rec2.record()
+                        ret.append(rec2.record())
                         is_first = False
                     else:
                         rec3 = copy.deepcopy(rec2)
                         rec3.hostname = ''
-                        ret += rec3.record()
+                        ret.append(rec3.record())
 
             # ------------------------------------------------------------
             # Only entries that have a non-empty hostname below this point
@@ -225,7 +232,7 @@ class Zone0:
             # - TXT records hold SPF records which are better listed close to the associated host
             # - CNAMEs are special. We look for cnames that are pointing to this host
             # - DKIMs always have a hostname part
-            for recs2 in self.dt.data.host_reclist:
+            for recs2 in host_reclist:
                 for rec2 in recs2:
                     # Look for relevant entries
                     if rec2.associated_hostname != hostname:
@@ -235,28 +242,26 @@ class Zone0:
                     if rec2.cooked_hostname == hostname:  # rec2.associated_hostname:
                         continue
 
-                    ret += rec2.record()
+                    ret.append(rec2.record())
 
         # Now do the rest entries
         last_nl_idx = -1  # Last index that a newline was added
-        for idx, recs in enumerate(self.dt.data.host_reclist):
-            for rec in sorted(recs):
+        for idx, recs in enumerate(host_reclist):
+            for rec in sorted(recs, key=vdns.rr.rr_sort_key):
                 if rec.hostname == '':
                     continue
                 if rec.associated_hostname not in done:
                     if last_nl_idx != idx:
-                        ret += '\n'
+                        ret.append('\n')
                         last_nl_idx = idx
-                    ret += rec.record()
+                    ret.append(rec.record())
 
-        return ret
+        return ''.join(ret)
 
     def make_reverse(self) -> str:
         """
         Make the reverse entries
         """
-        ret = ''
-
         # Create a dict and sort the keys. We list IPv4 before IPv6.
         # Keys are: X-Y where X is 4 or 6 depending on the family and
         # Y is the numerical representation of the address as returned by
@@ -265,7 +270,7 @@ class Zone0:
         # hosts = {}
         host: vdns.rr.Host
         hosts: list[vdns.rr.Host] = []
-        for host in sorted(self.dt.data.hosts):
+        for host in sorted(self.dt.data.hosts, key=_by_sort_key):
             # Skip entries that are not designated as reverse
             if not host.reverse:
                 continue
@@ -273,10 +278,7 @@ class Zone0:
             ptr = vdns.rr.PTR.from_host(host, self.dt.domain)
             hosts.append(ptr)
 
-        for rec in sorted(hosts):
-            ret += rec.record()
-
-        return ret
+        return ''.join([rec.record() for rec in sorted(hosts, key=_by_sort_key)])
 
     @dc.dataclass
     class MakeKeysItem:
@@ -34,7 +34,8 @@ class TestZoneMaker(unittest.TestCase):
     def setUp(self) -> None:
         vdns.db_testlib.init()
         vdns.db_testlib.init_db()
-        vdns.src.dynamic_testlib.init()
+        for p in vdns.src.dynamic_testlib.init().values():
+            self.addCleanup(p.stop)
         vdns.db_testlib.add_test_data()
 
     def _check_lines(self, lines: Sequence[str], needed_lines: NeedLines, ignore_spaces: bool = True) -> None:
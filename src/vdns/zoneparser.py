@@ -13,12 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
 import logging
 import datetime
 import dataclasses as dc
 
 from pprint import pprint
-from typing import Iterable, Optional
+from typing import Collection, Iterable, Optional
 
 __all__ = ['ZoneParser']
 
@@ -54,10 +55,14 @@ class ZoneParser:
     """
     dt: ParsedDomainData
     is_reverse: bool
+    # If set, only records of these types are parsed. The SOA is always parsed.
+    rrtypes: Optional[frozenset[str]]
 
-    def __init__(self, fn: Optional[str] = None, zone: Optional[str] = None, is_reverse: bool = False) -> None:
+    def __init__(self, fn: Optional[str] = None, zone: Optional[str] = None, is_reverse: bool = False,
+                 rrtypes: Optional[Collection[str]] = None) -> None:
         self.dt = ParsedDomainData()
         self.is_reverse = is_reverse
+        self.rrtypes = None if rrtypes is None else frozenset(rrtypes)
 
         if fn is not None:
             self.read(fn, zone)
@@ -108,14 +113,22 @@ class ZoneParser:
         except OSError:
             logging.error('Failed to open file: %s', fn)
             return None
-        return f.readlines()
+        # Slurp the file and split it once. A single read() is sized after the file, instead of the buffered
+        # reads that line iteration does.
+        with f:
+            return f.read().splitlines()
 
-    def read(self, fn: str, zone: Optional[str] = None) -> None:
-        """Reads and parses a file."""
+    def read(self, fn: str, zone: Optional[str] = None) -> bool:
+        """Reads and parses a file.
+
+        @return False if the file couldn't be read
+        """
         lines = self._read_file(fn)
-        if not lines:
-            return
-        self.parse(lines, zone)
+        if lines is None:
+            return False
+        if lines:
+            self.parse(lines, zone)
+        return True
 
     def parse(self, lines: Iterable[str], zone: Optional[str] = None) -> None:
         """Parses a set of lines.
@@ -231,12 +244,17 @@ class ZoneParser:
             if lastname is None and (r.addr1 is None or r.addr1 == '@'):
                 lastname = None
             elif r.addr1 is not None:
-                lastname = r.addr1
+                # Hostnames repeat a lot within and across zone files. Share a single string per hostname.
+                lastname = sys.intern(r.addr1)
 
             # For reverse we only need the soa
             if self.is_reverse:
                 continue
 
+            # Don't bother with records that the caller doesn't need
+            if self.rrtypes is not None and r.rr not in self.rrtypes:
+                continue
+
             # r2 = [lastname] + list(r[1:])
             entry = Entry(addr1=lastname, rr=r.rr, addr2=r.addr2)
             entryttl: Optional[datetime.timedelta] = None
@@ -13,7 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import datetime
+import tempfile
 import ipaddress
 import unittest
 import parameterized
@@ -157,3 +159,43 @@ ldap             1M     IN      CNAME   host2.v13.gr.
         self.assertCountEqual(dt.mx, res.mx)
         self.assertCountEqual(dt.dkim, res.dkim)
         self.assertCountEqual(dt.sshfp, res.sshfp)
+
+    def test_rrtypes(self) -> None:
+        contents = '''
+$ORIGIN         v13.gr.
+$TTL            1D      ; 1 day
+@               1D      IN      SOA     ns1.example.com. v13.v13.gr. ( 2021010302 1D 1H 90D 1M )
+                        IN      NS      ns1.dns.example.com.
+host3            15M    IN      SSHFP   1 1 1234567890abcdef1234567890abcdef12345678
+                        IN      A       10.1.1.3
+www                     IN      CNAME   host1
+'''
+        with mock.patch.object(ZoneParser, '_read_file', return_value=contents.splitlines()):
+            zp = ZoneParser(fn='somefile', rrtypes=('A', 'AAAA'))
+        dt = zp.data()
+        self.assertEqual(dt.soa.serial, 2021010302)
+        # The hostname carries over from the skipped record
+        self.assertEqual(dt.hosts, [vdns.rr.Host(domain='v13.gr', hostname='host3', ip=ip('10.1.1.3'), reverse=False)])
+        self.assertEqual(dt.ns, [])
+        self.assertEqual(dt.sshfp, [])
+        self.assertEqual(dt.cnames, [])
+
+    def test_read_file(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'zone')
+            with open(fn, 'w', encoding='ASCII') as f:
+                f.write('line1\n\nline3\n')
+            self.assertEqual(ZoneParser()._read_file(fn), ['line1', '', 'line3'])
+            self.assertIsNone(ZoneParser()._read_file(os.path.join(d, 'missing')))
+
+    def test_hostnames_interned(self) -> None:
+        contents = '''
+$ORIGIN         v13.gr.
+@               1D      IN      SOA     ns1.example.com. v13.v13.gr. ( 2021010302 1D 1H 90D 1M )
+host1                   IN      A       10.1.1.1
+host1                   IN      AAAA    2001:db8::1
+'''
+        with mock.patch.object(ZoneParser, '_read_file', return_value=contents.splitlines()):
+            zp = ZoneParser(fn='somefile')
+        h1, h2 = zp.data().hosts
+        self.assertIs(h1.hostname, h2.hostname)